@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+from odoo.tests import tagged
+
+from odoo.addons.farm_management_v18.tests.common import ComputeQueryCountCase
+
+
+@tagged('post_install', '-at_install')
+class TestAgriculturalComputeQueryCounts(ComputeQueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.farm_field = cls._create_farm_field()
+        cls.lot = cls.env['farm.lot'].create({
+            'name': 'Lote de Prueba', 'field_id': cls.farm_field.id, 'area': 500.0,
+        })
+        cls.crop = cls.env['product.product'].create({'name': 'Soja de Prueba', 'type': 'consu'})
+        cls.inputs = cls.env['product.product'].create([
+            {'name': 'Glifosato de Prueba', 'type': 'consu', 'standard_price': 12.0},
+            {'name': 'Fertilizante de Prueba', 'type': 'consu', 'standard_price': 30.0},
+        ])
+        cls.bom = cls.env['mrp.bom'].create({
+            'product_tmpl_id': cls.crop.product_tmpl_id.id,
+            'product_qty': 100.0,
+            'bom_line_ids': [(0, 0, {'product_id': product.id, 'product_qty': 200.0}) for product in cls.inputs],
+        })
+
+    def _create_productions(self, size):
+        return self.env['mrp.production'].create([{
+            'product_id': self.crop.id,
+            'product_qty': 1.0,
+            'bom_id': self.bom.id,
+            'field_id': self.farm_field.id,
+            'lot_id': self.lot.id,
+            'area': 100.0,
+            'date_planting': date(2024, 11, 1),
+            'date_harvest': date(2025, 4, 15),
+            'total_harvest_kg': 350000.0,
+        } for _index in range(size)])
+
+    def test_production_costs(self):
+        self.assertComputeQueries(
+            self._create_productions,
+            ['total_cost', 'cost_per_hectare', 'yield_per_hectare', 'campaign_duration'],
+            max_queries=8,
+        )
+
+    def test_raw_move_application(self):
+        def create_moves(size):
+            # Cada orden tiene un movimiento por insumo
+            productions = self._create_productions(-(-size // len(self.inputs)))
+            return productions.move_raw_ids[:size]
+
+        self.assertComputeQueries(
+            create_moves,
+            ['cost_per_hectare', 'applied_dose_per_hectare', 'quantity_done'],
+            max_queries=6,
+        )
+
+    def test_bom_line_cost_per_hectare(self):
+        def create_bom_lines(size):
+            return self.env['mrp.bom.line'].create([{
+                'bom_id': self.bom.id,
+                'product_id': self.inputs[index % len(self.inputs)].id,
+                'product_qty': 10.0 + index,
+            } for index in range(size)])
+
+        self.assertComputeQueries(create_bom_lines, ['cost_per_hectare'], max_queries=6)
@@ -1,3 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from . import models
\ No newline at end of file
+from . import controllers
+from . import models
+from . import wizard
@@ -42,6 +42,9 @@
         'contacts',
         'mail',
     ],
+    'external_dependencies': {
+        'python': ['numpy'],
+    },
     'data': [
         # Security
         'security/ir.model.access.csv',
@@ -50,6 +53,7 @@
         'views/farm_contract_views.xml',
         'views/farm_field_views.xml',
         'views/farm_lot_views.xml', 
+        'wizard/farm_boundary_import_wizard_views.xml',
         'views/menu_views.xml',
     ],
     'demo': [],
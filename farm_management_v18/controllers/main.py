@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+from odoo import http
+from odoo.http import request
+
+
+class FarmMapController(http.Controller):
+
+    @http.route('/farm_management/field/<int:field_id>/map', type='http', auth='user', methods=['GET'])
+    def field_map(self, field_id, zoom=None, tolerance=None, **kwargs):
+        """Devuelve los perímetros simplificados del campo y sus lotes (GeoJSON).
+
+        Acepta el nivel de zoom del mapa o una tolerancia en metros.
+        """
+        farm_field = request.env['farm.field'].browse(field_id).exists()
+        if not farm_field:
+            return request.not_found()
+        try:
+            payload = farm_field.get_lot_map_payload(
+                zoom=int(zoom) if zoom else None,
+                tolerance=float(tolerance) if tolerance else None,
+            )
+        except ValueError:
+            return request.make_json_response({'error': "Parámetros de zoom o tolerancia inválidos"}, status=400)
+        return request.make_json_response(payload)
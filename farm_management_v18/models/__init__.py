@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+from . import selection_label_mixin
+from . import geometry_mixin
+from . import import_mixin
 from . import farm_field
 from . import farm_lot
-from . import farm_contract
\ No newline at end of file
+from . import farm_contract
@@ -1,14 +1,23 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-import json
+from odoo.exceptions import ValidationError, UserError
+import io
+
+from .geometry_mixin import (
+    boundary_to_geojson, iter_geojson_features, iter_kml_features, measure_boundaries, parse_boundary,
+)
+
+# Propiedades de los elementos importados que identifican el campo y el lote
+BOUNDARY_FIELD_KEYS = ('field', 'campo', 'field_name', 'establecimiento')
+BOUNDARY_FIELD_CODE_KEYS = ('field_code', 'partida', 'real_estate_id')
+BOUNDARY_LOT_KEYS = ('lot', 'lote', 'lot_name')
 
 
 class FarmField(models.Model):
     _name = 'farm.field'
     _description = 'Campo Agropecuario'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'farm.geometry.mixin', 'farm.import.mixin']
     _order = 'name'
 
     name = fields.Char(
@@ -30,7 +39,7 @@ class FarmField(models.Model):
     
     geolocation_points = fields.Text(
         string='Puntos de Geolocalización',
-        help="Coordenadas geográficas que definen el perímetro del campo (formato JSON)"
+        help="Perímetro del campo: lista JSON de al menos tres puntos {\"lat\", \"lng\"} o un Polygon, MultiPolygon o Feature GeoJSON"
     )
     
     lot_ids = fields.One2many(
@@ -46,6 +55,14 @@ class FarmField(models.Model):
         help="Extensión total calculada como suma de las áreas de los lotes"
     )
     
+    total_measured_area = fields.Float(
+        string='Superficie Medida de Lotes (ha)',
+        compute='_compute_total_area',
+        store=True,
+        digits=(16, 2),
+        help="Suma de las superficies medidas en los perímetros de los lotes"
+    )
+    
     province_id = fields.Many2one(
         'res.country.state',
         string='Provincia',
@@ -80,11 +97,12 @@ class FarmField(models.Model):
     
     notes = fields.Text(string='Observaciones')
     
-    @api.depends('lot_ids.area')
+    @api.depends('lot_ids.area', 'lot_ids.measured_area')
     def _compute_total_area(self):
-        """Calcula el área total sumando las áreas de todos los lotes"""
+        """Calcula el área total sumando las áreas declaradas y medidas de todos los lotes"""
         for record in self:
             record.total_area = sum(record.lot_ids.mapped('area'))
+            record.total_measured_area = sum(record.lot_ids.mapped('measured_area'))
     
     @api.constrains('field_type', 'contract_id')
     def _check_contract_required(self):
@@ -101,17 +119,6 @@ class FarmField(models.Model):
         if self.field_type == 'own':
             self.contract_id = False
     
-    def validate_geolocation_points(self):
-        """Valida el formato JSON de los puntos de geolocalización"""
-        for record in self:
-            if record.geolocation_points:
-                try:
-                    json.loads(record.geolocation_points)
-                except (ValueError, TypeError):
-                    raise ValidationError(
-                        "Los puntos de geolocalización deben estar en formato JSON válido."
-                    )
-    
     @api.model
     def create(self, vals):
         """Override create para validaciones adicionales"""
@@ -126,6 +133,157 @@ class FarmField(models.Model):
             self.validate_geolocation_points()
         return result
     
+    @api.model
+    def import_boundaries(self, content, file_format=None, field_id=None, create_lots=False, skip_errors=False):
+        """Importa en bloque los perímetros de campos y lotes desde un GeoJSON o KML.
+
+        Cada elemento se asigna por sus propiedades: el campo por nombre o
+        partida inmobiliaria y el lote por nombre dentro del campo; si se
+        indica field_id, todos los elementos son lotes de ese campo. Los
+        campos y lotes se resuelven con una búsqueda cada uno, la geometría
+        se valida una sola vez por elemento y los lotes nuevos se crean con
+        un único create múltiple. Devuelve (campos, lotes, errores).
+        """
+        if not file_format:
+            file_format = 'kml' if content.lstrip()[:1] == b'<' else 'geojson'
+        try:
+            features = list(
+                iter_kml_features(io.BytesIO(content)) if file_format == 'kml' else iter_geojson_features(content)
+            )
+        except (ValueError, SyntaxError) as error:
+            raise UserError(f"No se pudo leer el archivo de perímetros: {error}")
+
+        def first_value(properties, keys):
+            return next((str(properties[key]).strip() for key in keys if properties.get(key)), '')
+
+        default_field = self.browse(field_id) if field_id else self.browse()
+        rows, errors = [], []
+        for number, (properties, geometry) in enumerate(features, start=1):
+            if properties is None:
+                errors.append(f"Elemento {number}: no es un elemento GeoJSON.")
+                continue
+            name = str(properties.get('name') or '').strip()
+            row = {
+                'number': number,
+                'field_ref': first_value(properties, BOUNDARY_FIELD_KEYS),
+                'field_code': first_value(properties, BOUNDARY_FIELD_CODE_KEYS),
+                'lot_name': first_value(properties, BOUNDARY_LOT_KEYS),
+            }
+            if default_field:
+                row['lot_name'] = row['lot_name'] or name
+            elif not row['field_ref'] and not row['field_code']:
+                # Sin referencia a un campo, el elemento es el perímetro del campo
+                row['field_ref'] = name
+            elif not row['lot_name'] and name != row['field_ref']:
+                row['lot_name'] = name
+            row['label'] = ' / '.join(filter(None, [row['field_ref'] or row['field_code'], row['lot_name']])) or '?'
+            if not geometry:
+                errors.append(f"Elemento {number} ({row['label']}): no tiene un polígono.")
+                continue
+            try:
+                row['geolocation_points'] = boundary_to_geojson(parse_boundary(geometry))
+            except (ValueError, TypeError) as error:
+                errors.append(f"Elemento {number} ({row['label']}): {error}")
+                continue
+            rows.append(row)
+
+        # Resolver todos los campos en una sola búsqueda
+        if default_field:
+            for row in rows:
+                row['field_id'] = default_field.id
+        else:
+            names = {row['field_ref'] for row in rows if row['field_ref']}
+            codes = {row['field_code'] for row in rows if row['field_code']}
+            farm_fields = self.search_read(
+                ['|', ('name', 'in', list(names)), ('real_estate_id', 'in', list(codes))],
+                ['name', 'real_estate_id'],
+            )
+            field_by_name = {farm_field['name']: farm_field['id'] for farm_field in farm_fields}
+            field_by_code = {
+                farm_field['real_estate_id']: farm_field['id'] for farm_field in farm_fields if farm_field['real_estate_id']
+            }
+            for row in rows:
+                row['field_id'] = field_by_code.get(row['field_code']) or field_by_name.get(row['field_ref'])
+
+        # Resolver todos los lotes en una sola búsqueda
+        lot_rows = [row for row in rows if row['field_id'] and row['lot_name']]
+        lot_by_key = {
+            (lot['field_id'][0], lot['name']): lot['id']
+            for lot in self.env['farm.lot'].with_context(active_test=False).search_read([
+                ('field_id', 'in', list({row['field_id'] for row in lot_rows})),
+                ('name', 'in', list({row['lot_name'] for row in lot_rows})),
+            ], ['field_id', 'name'])
+        } if lot_rows else {}
+
+        field_points, lot_points, new_lot_rows, seen = {}, {}, [], set()
+        for row in rows:
+            key = (row['field_id'], row['lot_name'])
+            if not row['field_id']:
+                errors.append(f"Elemento {row['number']} ({row['label']}): no se encontró el campo.")
+            elif key in seen:
+                errors.append(f"Elemento {row['number']} ({row['label']}): el perímetro está repetido en el archivo.")
+            elif not row['lot_name']:
+                field_points[row['field_id']] = row['geolocation_points']
+            elif key in lot_by_key:
+                lot_points[lot_by_key[key]] = row['geolocation_points']
+            elif create_lots:
+                new_lot_rows.append(row)
+            else:
+                errors.append(f"Elemento {row['number']} ({row['label']}): no existe el lote en el campo.")
+            seen.add(key)
+
+        # Los lotes nuevos toman como extensión la superficie medida, que debe
+        # ser mayor a cero con la precisión del campo
+        areas, _perimeters = measure_boundaries([row['geolocation_points'] for row in new_lot_rows])
+        measured_rows, lot_vals_list = [], []
+        for row, area in zip(new_lot_rows, areas.tolist()):
+            if round(area, 2) <= 0:
+                errors.append(
+                    f"Elemento {row['number']} ({row['label']}): la superficie del perímetro es menor a 0,01 ha."
+                )
+                continue
+            measured_rows.append(row)
+            lot_vals_list.append({
+                'name': row['lot_name'],
+                'field_id': row['field_id'],
+                'area': round(area, 2),
+                'geolocation_points': row['geolocation_points'],
+            })
+        new_lot_rows = measured_rows
+        conflicts = dict(self.env['farm.lot'].get_lot_name_conflicts(lot_vals_list))
+        for index, message in conflicts.items():
+            errors.append(f"Elemento {new_lot_rows[index]['number']} ({new_lot_rows[index]['label']}): {message}")
+
+        if errors and not skip_errors:
+            raise UserError("No se importaron los perímetros:\n" + self._format_import_errors(errors))
+
+        # Las geometrías ya están validadas: se guardan sin volver a interpretarlas
+        farm_fields = self._write_validated_boundaries(field_points)
+        lots = self.env['farm.lot']._write_validated_boundaries(lot_points)
+        lots |= self.env['farm.lot'].with_context(farm_geolocation_validated=True).create([
+            vals for index, vals in enumerate(lot_vals_list) if index not in conflicts
+        ]).with_env(self.env)
+        return farm_fields, lots, errors
+
+    def get_lot_map_payload(self, zoom=None, tolerance=None):
+        """Perímetro del campo y de todos sus lotes como FeatureCollection para el mapa.
+
+        La geometría se toma del nivel de simplificación precalculado que
+        corresponde al zoom o a la tolerancia (m) pedidos.
+        """
+        self.ensure_one()
+        self.check_access('read')
+        field_features = self._get_map_features(zoom, tolerance)
+        lot_features = self.env['farm.lot'].search([('field_id', '=', self.id)])._get_map_features(zoom, tolerance)
+        for kind, features in (('field', field_features), ('lot', lot_features)):
+            for feature in features:
+                feature['properties']['kind'] = kind
+        return {
+            'type': 'FeatureCollection',
+            'zoom_level': self._get_map_zoom_level(zoom, tolerance),
+            'features': field_features + lot_features,
+        }
+
     def name_get(self):
         """Personaliza la representación del nombre del campo"""
         result = []
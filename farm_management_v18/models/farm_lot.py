@@ -2,14 +2,21 @@
 
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-import json
+
+# Diferencia porcentual entre superficie declarada y medida a partir de la cual se informa
+AREA_DISCREPANCY_THRESHOLD = 5.0
 
 
 class FarmLot(models.Model):
     _name = 'farm.lot'
     _description = 'Lote de Campo'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'farm.geometry.mixin']
     _order = 'field_id, name'
+    _sql_constraints = [
+        ('field_name_uniq',
+         'UNIQUE (field_id, name)',
+         'Ya existe un lote con ese nombre en el campo.'),
+    ]
 
     name = fields.Char(
         string='Nombre del Lote',
@@ -33,7 +40,7 @@ class FarmLot(models.Model):
     
     geolocation_points = fields.Text(
         string='Puntos de Geolocalización',
-        help="Coordenadas que definen el perímetro del lote (formato JSON)"
+        help="Perímetro del lote: lista JSON de al menos tres puntos {\"lat\", \"lng\"} o un Polygon, MultiPolygon o Feature GeoJSON"
     )
     
     aptitude = fields.Selection([
@@ -68,6 +75,44 @@ class FarmLot(models.Model):
     
     notes = fields.Text(string='Observaciones')
     
+    area_discrepancy = fields.Float(
+        string='Diferencia de Superficie (ha)',
+        compute='_compute_area_discrepancy',
+        store=True,
+        digits=(16, 2),
+        help="Superficie medida menos superficie declarada"
+    )
+    
+    area_discrepancy_percent = fields.Float(
+        string='Diferencia de Superficie (%)',
+        compute='_compute_area_discrepancy',
+        store=True,
+        digits=(16, 1),
+        help="Diferencia respecto de la superficie declarada"
+    )
+    
+    area_mismatch = fields.Boolean(
+        string='Superficie a Revisar',
+        compute='_compute_area_discrepancy',
+        store=True,
+        help="La superficie medida difiere de la declarada en más del umbral admitido"
+    )
+    
+    @api.depends('area', 'measured_area')
+    def _compute_area_discrepancy(self):
+        """Compara la superficie declarada con la medida en el perímetro"""
+        for record in self:
+            if not record.measured_area:
+                record.area_discrepancy = 0.0
+                record.area_discrepancy_percent = 0.0
+                record.area_mismatch = False
+                continue
+            record.area_discrepancy = record.measured_area - record.area
+            record.area_discrepancy_percent = (
+                100.0 * record.area_discrepancy / record.area if record.area else 0.0
+            )
+            record.area_mismatch = abs(record.area_discrepancy_percent) > AREA_DISCREPANCY_THRESHOLD
+    
     @api.constrains('area')
     def _check_area_positive(self):
         """Valida que el área sea positiva"""
@@ -75,40 +120,46 @@ class FarmLot(models.Model):
             if record.area <= 0:
                 raise ValidationError("El área del lote debe ser mayor a cero.")
     
-    @api.constrains('name', 'field_id')
-    def _check_unique_name_per_field(self):
-        """Valida que no haya lotes con el mismo nombre en un campo"""
-        for record in self:
-            if record.field_id:
-                existing = self.search([
-                    ('name', '=', record.name),
-                    ('field_id', '=', record.field_id.id),
-                    ('id', '!=', record.id)
-                ])
-                if existing:
-                    field_name = record.field_id.name if record.field_id else 'campo desconocido'
-                    raise ValidationError(
-                        f"Ya existe un lote con el nombre '{record.name}' "
-                        f"en el campo '{field_name}'."
-                    )
-    
-    def validate_geolocation_points(self):
-        """Valida el formato JSON de los puntos de geolocalización"""
-        for record in self:
-            if record.geolocation_points:
-                try:
-                    json.loads(record.geolocation_points)
-                except (ValueError, TypeError):
-                    raise ValidationError(
-                        "Los puntos de geolocalización deben estar en formato JSON válido."
-                    )
-    
     @api.model
-    def create(self, vals):
+    def get_lot_name_conflicts(self, vals_list):
+        """Informa de una vez todos los lotes cuyo nombre ya está usado en su campo.
+
+        Pensado para importaciones: revisa los lotes existentes con una sola
+        consulta y también los nombres repetidos dentro de vals_list.
+        Devuelve una lista de (índice en vals_list, mensaje).
+        """
+        keys = [(vals.get('field_id'), vals.get('name')) for vals in vals_list]
+        pairs = [key for key in keys if key[0] and key[1]]
+        existing = set()
+        if pairs:
+            self.flush_model(['field_id', 'name'])
+            field_ids, names = zip(*pairs)
+            self.env.cr.execute("""
+                SELECT l.field_id, l.name
+                  FROM farm_lot l
+                  JOIN unnest(%s::int[], %s::varchar[]) AS k(field_id, name)
+                    ON k.field_id = l.field_id AND k.name = l.name
+            """, [list(field_ids), list(names)])
+            existing = set(self.env.cr.fetchall())
+        farm_fields = self.env['farm.field'].browse({key[0] for key in pairs})
+        field_names = dict(zip(farm_fields.ids, farm_fields.mapped('name')))
+        conflicts = []
+        seen = set()
+        for index, key in enumerate(keys):
+            if key in existing:
+                conflicts.append((index, f"ya existe un lote con el nombre '{key[1]}' en el campo '{field_names.get(key[0])}'."))
+            elif key in seen:
+                conflicts.append((index, f"el nombre '{key[1]}' está repetido para el campo '{field_names.get(key[0])}'."))
+            if key[0] and key[1]:
+                seen.add(key)
+        return conflicts
+    
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create para validaciones adicionales"""
-        record = super(FarmLot, self).create(vals)
-        record.validate_geolocation_points()
-        return record
+        records = super(FarmLot, self).create(vals_list)
+        records.validate_geolocation_points()
+        return records
     
     def write(self, vals):
         """Override write para validaciones adicionales"""
@@ -117,6 +168,34 @@ class FarmLot(models.Model):
             self.validate_geolocation_points()
         return result
     
+    @api.model
+    def get_area_discrepancy_report(self, company_id=None, threshold=AREA_DISCREPANCY_THRESHOLD):
+        """Devuelve los lotes medidos cuya superficie difiere de la declarada más que el umbral.
+
+        Lee las mediciones guardadas con una sola consulta; ordena de mayor a
+        menor diferencia absoluta.
+        """
+        domain = [('measured_area', '>', 0)]
+        if company_id:
+            domain.append(('company_id', '=', company_id))
+        lots = self.search_read(domain, [
+            'name', 'field_id', 'area', 'measured_area', 'area_discrepancy', 'area_discrepancy_percent',
+        ])
+        report = [lot for lot in lots if abs(lot['area_discrepancy_percent']) > threshold]
+        return sorted(report, key=lambda lot: abs(lot['area_discrepancy']), reverse=True)
+    
+    def action_remeasure_boundaries(self):
+        """Vuelve a medir los perímetros de los lotes (por ejemplo, después de una importación)"""
+        lots = self or self.search([('boundary_geojson', '!=', False)])
+        lot_fields = ['measured_area', 'measured_perimeter', 'area_discrepancy', 'area_discrepancy_percent', 'area_mismatch']
+        for fname in lot_fields:
+            self.env.add_to_compute(self._fields[fname], lots)
+        for fname in ('total_area', 'total_measured_area'):
+            self.env.add_to_compute(lots.field_id._fields[fname], lots.field_id)
+        lots.flush_recordset(lot_fields)
+        lots.field_id.flush_recordset(['total_area', 'total_measured_area'])
+        return True
+    
     def name_get(self):
         """Personaliza la representación del nombre del lote"""
         result = []
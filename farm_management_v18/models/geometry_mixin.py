@@ -0,0 +1,601 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, tools
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+import json
+from collections import defaultdict
+from xml.etree import ElementTree
+
+import numpy as np
+
+# Radio medio de la Tierra (m) para las mediciones esféricas
+EARTH_RADIUS_M = 6371008.8
+
+# Decimales de las coordenadas guardadas (7 decimales son ~1 cm)
+COORDINATE_PRECISION = 7
+
+# Niveles de zoom del mapa con geometría simplificada precalculada
+MAP_ZOOM_LEVELS = (10, 13, 16)
+
+# Metros por píxel de un mosaico de 256 px en el ecuador con zoom 0
+METERS_PER_PIXEL_ZOOM_0 = 156543.03
+
+# Campos que leen las búsquedas espaciales por SQL
+GEOMETRY_FIELDS = [
+    'boundary_geojson', 'bbox_min_lng', 'bbox_min_lat', 'bbox_max_lng', 'bbox_max_lat', 'active',
+]
+
+
+def _parse_point(point):
+    """Convierte un punto {"lat", "lng"} o [lng, lat] en (lng, lat)"""
+    if isinstance(point, dict):
+        lat = point.get('lat', point.get('latitude'))
+        lng = point.get('lng', point.get('lon', point.get('longitude')))
+    elif isinstance(point, (list, tuple)) and len(point) >= 2:
+        lng, lat = point[0], point[1]
+    else:
+        raise ValueError(f"Punto inválido: {point!r}")
+    try:
+        lng, lat = float(lng), float(lat)
+    except (TypeError, ValueError):
+        raise ValueError(f"Coordenadas inválidas: {point!r}")
+    if not (-180.0 <= lng <= 180.0 and -90.0 <= lat <= 90.0):
+        raise ValueError(f"Coordenadas fuera de rango: {point!r}")
+    return round(lng, COORDINATE_PRECISION), round(lat, COORDINATE_PRECISION)
+
+
+def _parse_ring(points):
+    """Normaliza un anillo: coordenadas (lng, lat), sin repetidos consecutivos y cerrado"""
+    if not isinstance(points, (list, tuple)):
+        raise ValueError("Cada anillo del polígono debe ser una lista de puntos")
+    ring = []
+    for point in points:
+        coordinates = _parse_point(point)
+        if not ring or ring[-1] != coordinates:
+            ring.append(coordinates)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len(set(ring)) < 3:
+        raise ValueError("Un polígono necesita al menos tres puntos distintos")
+    return ring + [ring[0]]
+
+
+def parse_boundary(value):
+    """Convierte los puntos de geolocalización en una lista de polígonos.
+
+    Acepta una lista de puntos {"lat", "lng"} o [lng, lat], o un Polygon,
+    MultiPolygon o Feature GeoJSON. Cada polígono es una lista de anillos
+    (el primero es el borde exterior y el resto huecos) de puntos (lng, lat).
+    Lanza ValueError si el valor no describe un polígono válido.
+    """
+    data = json.loads(value) if isinstance(value, str) else value
+    if isinstance(data, dict) and data.get('type') == 'Feature':
+        data = data.get('geometry') or {}
+    if isinstance(data, dict):
+        if data.get('type') == 'Polygon':
+            polygons = [data.get('coordinates')]
+        elif data.get('type') == 'MultiPolygon':
+            polygons = data.get('coordinates')
+        else:
+            raise ValueError(f"Tipo de geometría no soportado: {data.get('type')}")
+    elif isinstance(data, list) and data:
+        polygons = [[data]]
+    else:
+        raise ValueError("Se esperaba una lista de puntos o una geometría GeoJSON")
+    if not isinstance(polygons, list) or not polygons:
+        raise ValueError("La geometría no tiene coordenadas")
+    for polygon in polygons:
+        if not isinstance(polygon, list) or not polygon:
+            raise ValueError("Cada polígono debe ser una lista de anillos")
+    return [[_parse_ring(ring) for ring in polygon] for polygon in polygons]
+
+
+def boundary_to_geojson(polygons):
+    """Serializa los polígonos como GeoJSON compacto (Polygon o MultiPolygon)"""
+    if len(polygons) == 1:
+        geometry = {'type': 'Polygon', 'coordinates': polygons[0]}
+    else:
+        geometry = {'type': 'MultiPolygon', 'coordinates': polygons}
+    return json.dumps(geometry, separators=(',', ':'))
+
+
+def boundary_from_geojson(value):
+    """Lee la geometría guardada como lista de polígonos de puntos (lng, lat)"""
+    geometry = json.loads(value)
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    return [[[tuple(point) for point in ring] for ring in polygon] for polygon in polygons]
+
+
+def measure_boundaries(geometries):
+    """Mide superficie (ha) y perímetro (m) de muchas geometrías en una sola pasada.
+
+    geometries es una lista de GeoJSON guardados (o False); devuelve dos
+    arrays alineados con ella. Todos los anillos se concatenan en un único
+    array de vértices: la superficie sale del exceso esférico de cada
+    segmento y el perímetro de la distancia de haversine, sumados por
+    anillo y por geometría con bincount. Los huecos restan superficie.
+    """
+    rings, ring_owners, ring_signs = [], [], []
+    for index, geojson in enumerate(geometries):
+        if not geojson:
+            continue
+        for polygon in boundary_from_geojson(geojson):
+            for position, ring in enumerate(polygon):
+                rings.append(np.asarray(ring, dtype=float))
+                ring_owners.append(index)
+                ring_signs.append(-1.0 if position else 1.0)
+    areas = np.zeros(len(geometries))
+    perimeters = np.zeros(len(geometries))
+    if not rings:
+        return areas, perimeters
+
+    points = np.radians(np.concatenate(rings))
+    sizes = np.array([len(ring) for ring in rings])
+    # Cada vértice inicia un segmento salvo el último de cada anillo (que repite el primero)
+    starts = np.ones(len(points), dtype=bool)
+    starts[np.cumsum(sizes) - 1] = False
+    start_index = np.flatnonzero(starts)
+    segment_ring = np.repeat(np.arange(len(rings)), sizes - 1)
+    lng1, lat1 = points[start_index].T
+    lng2, lat2 = points[start_index + 1].T
+    dlng = (lng2 - lng1 + np.pi) % (2 * np.pi) - np.pi
+
+    excess = np.bincount(segment_ring, weights=dlng * (2 + np.sin(lat1) + np.sin(lat2)), minlength=len(rings))
+    ring_areas = np.abs(excess) * EARTH_RADIUS_M ** 2 / 2
+    haversine = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    lengths = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(haversine, 0.0, 1.0)))
+    ring_perimeters = np.bincount(segment_ring, weights=lengths, minlength=len(rings))
+
+    ring_owners = np.array(ring_owners)
+    areas += np.bincount(ring_owners, weights=ring_areas * np.array(ring_signs), minlength=len(geometries)) / 10000.0
+    perimeters += np.bincount(ring_owners, weights=ring_perimeters, minlength=len(geometries))
+    return areas, perimeters
+
+
+def iter_geojson_features(content):
+    """Recorre los elementos de un FeatureCollection (o un Feature) GeoJSON.
+
+    Devuelve (propiedades, geometría) por elemento, sin validar la geometría;
+    los elementos que no son un objeto se devuelven como (None, None) para
+    informarlos por separado.
+    """
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("El archivo GeoJSON debe ser un FeatureCollection o un Feature")
+    if data.get('type') == 'Feature':
+        features = [data]
+    elif data.get('type') == 'FeatureCollection':
+        features = data.get('features') or []
+    else:
+        raise ValueError("El archivo GeoJSON debe ser un FeatureCollection o un Feature")
+    for feature in features:
+        if not isinstance(feature, dict):
+            yield None, None
+            continue
+        properties = feature.get('properties')
+        yield dict(properties) if isinstance(properties, dict) else {}, feature.get('geometry')
+
+
+def _kml_tag(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def _kml_ring(element):
+    """Coordenadas "lng,lat[,alt] ..." de un LinearRing KML como lista de [lng, lat]"""
+    text = next((child.text for child in element.iter() if _kml_tag(child) == 'coordinates'), '') or ''
+    return [tuple(point.split(',')[:2]) for point in text.split()]
+
+
+def iter_kml_features(content):
+    """Recorre los Placemark de un KML leyéndolo de a un elemento.
+
+    Devuelve (propiedades, geometría GeoJSON) por Placemark; las propiedades
+    incluyen el nombre y los datos extendidos (Data y SimpleData).
+    """
+    for _event, element in ElementTree.iterparse(content, events=('end',)):
+        if _kml_tag(element) != 'Placemark':
+            continue
+        properties = {}
+        polygons = []
+        for child in element.iter():
+            tag = _kml_tag(child)
+            if tag == 'name' and 'name' not in properties:
+                properties['name'] = (child.text or '').strip()
+            elif tag == 'Data':
+                value = next((item.text for item in child if _kml_tag(item) == 'value'), None)
+                properties[child.get('name')] = (value or '').strip()
+            elif tag == 'SimpleData':
+                properties[child.get('name')] = (child.text or '').strip()
+            elif tag == 'Polygon':
+                outer = [ring for boundary in child if _kml_tag(boundary) == 'outerBoundaryIs' for ring in boundary]
+                inner = [ring for boundary in child if _kml_tag(boundary) == 'innerBoundaryIs' for ring in boundary]
+                polygons.append([_kml_ring(ring) for ring in outer + inner])
+        element.clear()
+        geometry = {'type': 'MultiPolygon', 'coordinates': polygons} if polygons else None
+        yield properties, geometry
+
+
+def zoom_tolerance(zoom):
+    """Tolerancia de simplificación (m) equivalente a un píxel en el nivel de zoom"""
+    return METERS_PER_PIXEL_ZOOM_0 / 2 ** zoom
+
+
+def _simplify_ring(ring, tolerance):
+    """Simplifica un anillo cerrado con Douglas-Peucker sobre coordenadas métricas locales.
+
+    Conserva al menos tres vértices distintos para no degenerar el polígono.
+    """
+    points = np.asarray(ring, dtype=float)
+    if len(points) <= 4:
+        return ring
+    scale = np.radians(EARTH_RADIUS_M) * np.array([np.cos(np.radians(points[:, 1].mean())), 1.0])
+    xy = points * scale
+    keep = np.zeros(len(xy), dtype=bool)
+    keep[[0, -1]] = True
+
+    def farthest(start, end):
+        """Índice y distancia del vértice más alejado del segmento entre start y end"""
+        segment = xy[end] - xy[start]
+        offsets = xy[start + 1:end] - xy[start]
+        length = segment @ segment
+        if length:
+            position = np.clip(offsets @ segment / length, 0.0, 1.0)
+            offsets = offsets - np.outer(position, segment)
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        index = int(distances.argmax())
+        return start + 1 + index, distances[index]
+
+    # El anillo empieza y termina en el mismo punto: se corta en el vértice más lejano
+    split, _distance = farthest(0, len(xy) - 1)
+    keep[split] = True
+    stack = [(0, split), (split, len(xy) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        index, distance = farthest(start, end)
+        if distance > tolerance:
+            keep[index] = True
+            stack += [(start, index), (index, end)]
+    if keep.sum() < 4:
+        index, _distance = max(farthest(0, split), farthest(split, len(xy) - 1), key=lambda item: item[1])
+        keep[index] = True
+    return [tuple(point) for point in points[keep].tolist()]
+
+
+def simplify_boundary(polygons, tolerance):
+    """Simplifica los polígonos con la tolerancia (m) indicada; descarta los huecos menores"""
+    simplified = []
+    for outer, *holes in polygons:
+        rings = [_simplify_ring(outer, tolerance)]
+        for hole in holes:
+            hole = _simplify_ring(hole, tolerance)
+            if len(set(hole)) >= 3 and hole != rings[0]:
+                rings.append(hole)
+        simplified.append(rings)
+    return simplified
+
+
+def _segments(ring):
+    return zip(ring, ring[1:])
+
+
+def _orientation(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _on_segment(a, b, point):
+    return (
+        _orientation(a, b, point) == 0
+        and min(a[0], b[0]) <= point[0] <= max(a[0], b[0])
+        and min(a[1], b[1]) <= point[1] <= max(a[1], b[1])
+    )
+
+
+def _ring_position(ring, point):
+    """1 si el punto está dentro del anillo, 0 si está sobre el borde y -1 si está fuera"""
+    x, y = point
+    inside = False
+    for a, b in _segments(ring):
+        if _on_segment(a, b, point):
+            return 0
+        if (a[1] > y) != (b[1] > y) and x < a[0] + (y - a[1]) * (b[0] - a[0]) / (b[1] - a[1]):
+            inside = not inside
+    return 1 if inside else -1
+
+
+def point_position(polygons, point):
+    """1 si el punto está dentro de la geometría, 0 si está sobre un borde y -1 si está fuera"""
+    best = -1
+    for outer, *holes in polygons:
+        position = _ring_position(outer, point)
+        for hole in holes:
+            if position < 0:
+                break
+            hole_position = _ring_position(hole, point)
+            position = min(position, -hole_position)
+        best = max(best, position)
+    return best
+
+
+def _interior_point(polygons):
+    """Un punto interior de la geometría, si se encuentra uno sencillo"""
+    for outer, *_holes in polygons:
+        vertices = outer[:-1]
+        centroid = (sum(x for x, y in vertices) / len(vertices), sum(y for x, y in vertices) / len(vertices))
+        if point_position(polygons, centroid) > 0:
+            return centroid
+        for index in range(len(vertices)):
+            a, b, c = vertices[index - 1], vertices[index], vertices[(index + 1) % len(vertices)]
+            candidate = ((a[0] + b[0] + c[0]) / 3, (a[1] + b[1] + c[1]) / 3)
+            if point_position(polygons, candidate) > 0:
+                return candidate
+    return None
+
+
+def geometries_overlap(first, second):
+    """Indica si los interiores de dos geometrías se superponen.
+
+    Los lotes vecinos que sólo comparten un borde o un vértice no se
+    consideran superpuestos.
+    """
+    first_segments = [segment for polygon in first for ring in polygon for segment in _segments(ring)]
+    second_segments = [segment for polygon in second for ring in polygon for segment in _segments(ring)]
+    for a, b in first_segments:
+        for c, d in second_segments:
+            # Cruce propio: cada segmento deja los extremos del otro a lados opuestos
+            if (_orientation(a, b, c) * _orientation(a, b, d) < 0
+                    and _orientation(c, d, a) * _orientation(c, d, b) < 0):
+                return True
+    for geometry, segments, other in ((first, first_segments, second), (second, second_segments, first)):
+        for a, b in segments:
+            for point in (a, ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)):
+                if point_position(other, point) > 0:
+                    return True
+        # Geometrías idénticas o con bordes coincidentes
+        interior = _interior_point(geometry)
+        if interior and point_position(other, interior) > 0:
+            return True
+    return False
+
+
+class GeometryMixin(models.AbstractModel):
+    _name = 'farm.geometry.mixin'
+    _description = 'Perímetro Geográfico'
+
+    geolocation_points = fields.Text(
+        string='Puntos de Geolocalización',
+        help="Perímetro: lista JSON de al menos tres puntos {\"lat\", \"lng\"} o un Polygon, MultiPolygon o Feature GeoJSON"
+    )
+
+    boundary_geojson = fields.Text(
+        string='Geometría del Perímetro',
+        compute='_compute_boundary',
+        store=True,
+        help="Perímetro normalizado como GeoJSON (longitud, latitud)"
+    )
+
+    bbox_min_lng = fields.Float(string='Longitud Mínima', compute='_compute_boundary', store=True, digits=(10, 7))
+    bbox_min_lat = fields.Float(string='Latitud Mínima', compute='_compute_boundary', store=True, digits=(10, 7))
+    bbox_max_lng = fields.Float(string='Longitud Máxima', compute='_compute_boundary', store=True, digits=(10, 7))
+    bbox_max_lat = fields.Float(string='Latitud Máxima', compute='_compute_boundary', store=True, digits=(10, 7))
+
+    measured_area = fields.Float(
+        string='Superficie Medida (ha)',
+        compute='_compute_measurements',
+        store=True,
+        digits=(16, 2),
+        help="Superficie calculada a partir del perímetro georreferenciado"
+    )
+
+    measured_perimeter = fields.Float(
+        string='Perímetro Medido (m)',
+        compute='_compute_measurements',
+        store=True,
+        digits=(16, 1),
+        help="Longitud del perímetro georreferenciado"
+    )
+
+    boundary_simplified = fields.Text(
+        string='Perímetro Simplificado',
+        compute='_compute_boundary_simplified',
+        store=True,
+        help="Perímetro simplificado para cada nivel de zoom del mapa (JSON)"
+    )
+
+    def init(self):
+        """Índice espacial sobre el rectángulo envolvente, con tipos geométricos nativos de PostgreSQL"""
+        if self._abstract:
+            return
+        tools.create_index(
+            self.env.cr, f'{self._table}_boundary_bbox_index', self._table,
+            ['box(point(bbox_min_lng, bbox_min_lat), point(bbox_max_lng, bbox_max_lat))'],
+            method='gist', where='boundary_geojson IS NOT NULL',
+        )
+
+    @api.depends('geolocation_points')
+    def _compute_boundary(self):
+        """Interpreta los puntos una sola vez y guarda la geometría y su rectángulo envolvente"""
+        for record in self:
+            try:
+                polygons = parse_boundary(record.geolocation_points) if record.geolocation_points else None
+            except (ValueError, TypeError):
+                # validate_geolocation_points informa el error al guardar
+                polygons = None
+            if not polygons:
+                record.boundary_geojson = False
+                record.bbox_min_lng = record.bbox_min_lat = record.bbox_max_lng = record.bbox_max_lat = 0.0
+                continue
+            points = [point for polygon in polygons for point in polygon[0]]
+            record.boundary_geojson = boundary_to_geojson(polygons)
+            record.bbox_min_lng = min(lng for lng, lat in points)
+            record.bbox_min_lat = min(lat for lng, lat in points)
+            record.bbox_max_lng = max(lng for lng, lat in points)
+            record.bbox_max_lat = max(lat for lng, lat in points)
+
+    @api.depends('boundary_geojson')
+    def _compute_measurements(self):
+        """Mide todo el recordset en una sola pasada vectorizada"""
+        areas, perimeters = measure_boundaries(self.mapped('boundary_geojson'))
+        for record, area, perimeter in zip(self, areas.tolist(), perimeters.tolist()):
+            record.measured_area = area
+            record.measured_perimeter = perimeter
+
+    @api.depends('boundary_geojson')
+    def _compute_boundary_simplified(self):
+        """Precalcula la geometría simplificada de cada nivel de zoom; se recalcula al cambiar el perímetro"""
+        for record in self:
+            if not record.boundary_geojson:
+                record.boundary_simplified = False
+                continue
+            polygons = boundary_from_geojson(record.boundary_geojson)
+            record.boundary_simplified = json.dumps({
+                str(zoom): json.loads(boundary_to_geojson(simplify_boundary(polygons, zoom_tolerance(zoom))))
+                for zoom in MAP_ZOOM_LEVELS
+            }, separators=(',', ':'))
+
+    @api.model
+    def _get_map_zoom_level(self, zoom=None, tolerance=None):
+        """Nivel precalculado más simple que respeta la tolerancia (m) o el zoom pedidos.
+
+        Devuelve None si se pide más detalle que el del nivel más fino, en
+        cuyo caso se usa el perímetro completo.
+        """
+        if tolerance is None:
+            if zoom is None:
+                return str(MAP_ZOOM_LEVELS[0])
+            tolerance = zoom_tolerance(zoom)
+        levels = [level for level in MAP_ZOOM_LEVELS if zoom_tolerance(level) <= tolerance]
+        return str(levels[0]) if levels else None
+
+    def _get_map_features(self, zoom=None, tolerance=None):
+        """Elementos GeoJSON del recordset para el mapa, con la geometría del nivel pedido"""
+        level = self._get_map_zoom_level(zoom, tolerance)
+        records = self.search_read(
+            [('id', 'in', self.ids), ('boundary_geojson', '!=', False)],
+            ['display_name', 'boundary_simplified' if level else 'boundary_geojson'],
+        )
+        return [{
+            'type': 'Feature',
+            'id': record['id'],
+            'properties': {'name': record['display_name']},
+            'geometry': json.loads(record['boundary_simplified'])[level] if level
+                        else json.loads(record['boundary_geojson']),
+        } for record in records]
+
+    def validate_geolocation_points(self):
+        """Valida que los puntos de geolocalización describan un polígono"""
+        if self.env.context.get('farm_geolocation_validated'):
+            # Geometrías ya validadas por el importador de perímetros
+            return
+        # Sólo se vuelven a interpretar los que no generaron geometría
+        for record in self.filtered(lambda record: record.geolocation_points and not record.boundary_geojson):
+            try:
+                parse_boundary(record.geolocation_points)
+            except (ValueError, TypeError) as error:
+                raise ValidationError(
+                    f"Los puntos de geolocalización de '{record.display_name}' no son válidos: {error}"
+                )
+
+    @api.model
+    def _write_validated_boundaries(self, points_by_id):
+        """Guarda perímetros ya validados, {id: puntos}, con una sola verificación de acceso.
+
+        Los registros con el mismo perímetro se escriben juntos y la base se
+        actualiza en un único flush al final. Devuelve los registros.
+        """
+        records = self.browse(list(points_by_id))
+        records.check_access('write')
+        ids_by_points = defaultdict(list)
+        for record_id, points in points_by_id.items():
+            ids_by_points[points].append(record_id)
+        validated = records.sudo().with_context(farm_geolocation_validated=True)
+        for points, ids in ids_by_points.items():
+            validated.browse(ids).write({'geolocation_points': points})
+        records.flush_recordset()
+        return records
+
+    def _get_boundary(self):
+        """Polígonos del perímetro del registro, o una lista vacía si no tiene"""
+        self.ensure_one()
+        return boundary_from_geojson(self.boundary_geojson) if self.boundary_geojson else []
+
+    @api.model
+    @tools.ormcache()
+    def _has_postgis(self):
+        """Indica si la base de datos tiene instalada la extensión PostGIS"""
+        self.env.cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def search_by_point(self, latitude, longitude):
+        """Devuelve los registros activos cuyo perímetro contiene el punto GPS.
+
+        El índice del rectángulo envolvente selecciona los candidatos; la
+        prueba exacta se hace con PostGIS si está disponible o en Python
+        sobre esos candidatos.
+        """
+        self.flush_model(GEOMETRY_FIELDS)
+        postgis = self._has_postgis()
+        query = SQL(
+            """
+            SELECT id, boundary_geojson
+              FROM %(table)s
+             WHERE active AND boundary_geojson IS NOT NULL
+               AND box(point(bbox_min_lng, bbox_min_lat), point(bbox_max_lng, bbox_max_lat))
+                   @> box(point(%(lng)s, %(lat)s), point(%(lng)s, %(lat)s))
+               %(exact)s
+            """,
+            table=SQL.identifier(self._table),
+            lng=longitude,
+            lat=latitude,
+            exact=SQL(
+                "AND ST_Intersects(ST_GeomFromGeoJSON(boundary_geojson), ST_SetSRID(ST_MakePoint(%s, %s), 4326))",
+                longitude, latitude,
+            ) if postgis else SQL(),
+        )
+        self.env.cr.execute(query)
+        point = (longitude, latitude)
+        return self.browse([
+            record_id for record_id, geojson in self.env.cr.fetchall()
+            if postgis or point_position(boundary_from_geojson(geojson), point) >= 0
+        ])
+
+    def get_overlaps(self):
+        """Devuelve los pares (registro, otro registro) cuyos perímetros se superponen.
+
+        Compara los registros del recordset con todos los registros activos,
+        usando el índice para descartar los que no comparten rectángulo
+        envolvente. Cada par se informa una sola vez.
+        """
+        records = self.filtered('boundary_geojson')
+        if not records:
+            return []
+        self.flush_model(GEOMETRY_FIELDS)
+        postgis = self._has_postgis()
+        query = SQL(
+            """
+            SELECT a.id, b.id, a.boundary_geojson, b.boundary_geojson
+              FROM %(table)s a
+              JOIN %(table)s b
+                ON b.id != a.id AND b.active AND b.boundary_geojson IS NOT NULL
+               AND box(point(b.bbox_min_lng, b.bbox_min_lat), point(b.bbox_max_lng, b.bbox_max_lat))
+                   && box(point(a.bbox_min_lng, a.bbox_min_lat), point(a.bbox_max_lng, a.bbox_max_lat))
+             WHERE a.id IN %(ids)s
+               AND (a.id < b.id OR b.id NOT IN %(ids)s)
+               %(exact)s
+             ORDER BY a.id, b.id
+            """,
+            table=SQL.identifier(self._table),
+            ids=tuple(records.ids),
+            exact=SQL(
+                "AND ST_Relate(ST_GeomFromGeoJSON(a.boundary_geojson), ST_GeomFromGeoJSON(b.boundary_geojson), '2********')"
+            ) if postgis else SQL(),
+        )
+        self.env.cr.execute(query)
+        return [
+            (self.browse(first_id), self.browse(second_id))
+            for first_id, second_id, first_geojson, second_geojson in self.env.cr.fetchall()
+            if postgis or geometries_overlap(boundary_from_geojson(first_geojson), boundary_from_geojson(second_geojson))
+        ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+
+# Cantidad de errores que se muestran al usuario al importar
+IMPORT_ERRORS_DISPLAY_LIMIT = 50
+
+
+class ImportMixin(models.AbstractModel):
+    _name = 'farm.import.mixin'
+    _description = 'Utilidades de Importación en Bloque'
+
+    @api.model
+    def _format_import_errors(self, errors, limit=IMPORT_ERRORS_DISPLAY_LIMIT):
+        """Resume la lista de errores de importación para mostrarla al usuario"""
+        message = "\n".join(errors[:limit])
+        if len(errors) > limit:
+            message += f"\n... y {len(errors) - limit} errores más."
+        return message
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api, tools
+from odoo.tools import frozendict
+
+
+class SelectionLabelMixin(models.AbstractModel):
+    _name = 'farm.selection.label.mixin'
+    _description = 'Etiquetas de Selección en Caché'
+
+    @api.model
+    @tools.ormcache('field_name', 'self.env.lang')
+    def _get_selection_labels(self, field_name):
+        """Devuelve {valor: etiqueta} de un campo de selección, traducido al idioma actual.
+
+        Se calcula una vez por modelo, campo e idioma y se invalida con el registro,
+        por lo que no debe modificarse el diccionario devuelto.
+        """
+        return frozendict(self._fields[field_name]._description_selection(self.env))
+
+    def _get_selection_label(self, field_name, value=None):
+        """Etiqueta del valor indicado o, si no se indica, del valor del registro"""
+        if value is None:
+            self.ensure_one()
+            value = self[field_name]
+        return self._get_selection_labels(field_name).get(value, value or '')
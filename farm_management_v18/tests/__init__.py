@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_compute_query_counts
+from . import test_geometry
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase
+
+# Tamaños de recordset sobre los que se recalcula cada campo
+QUERY_COUNT_SIZES = (1, 10, 1000)
+
+
+class FarmTestCase(TransactionCase):
+    """Base de las pruebas que necesitan campos agropecuarios"""
+
+    @classmethod
+    def _create_farm_field(cls, name='Campo de Prueba'):
+        """Crea un campo en una provincia argentina"""
+        province = cls.env['res.country.state'].search([('country_id.code', '=', 'AR')], limit=1)
+        if not province:
+            province = cls.env['res.country.state'].create({
+                'name': 'Provincia de Prueba', 'code': 'PDP', 'country_id': cls.env.ref('base.ar').id,
+            })
+        return cls.env['farm.field'].create({'name': name, 'province_id': province.id})
+
+
+class ComputeQueryCountCase(FarmTestCase):
+    """Base para vigilar la cantidad de consultas de los campos calculados.
+
+    Cada verificación arma recordsets de QUERY_COUNT_SIZES, recalcula los
+    campos con la caché vacía y falla si se supera el máximo permitido o si
+    las consultas crecen con la cantidad de registros.
+    """
+
+    def _count_compute_queries(self, records, field_names):
+        """Cantidad de consultas para recalcular los campos sobre todo el recordset"""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        stored = [fname for fname in field_names if records._fields[fname].store]
+        for fname in stored:
+            self.env.add_to_compute(records._fields[fname], records)
+        
+        queries_before = self.env.cr.sql_log_count
+        if stored:
+            records._recompute_recordset(stored)
+        for fname in field_names:
+            if fname not in stored:
+                records.mapped(fname)
+        queries = self.env.cr.sql_log_count - queries_before
+        
+        self.env.flush_all()
+        return queries
+
+    def assertComputeQueries(self, create_records, field_names, max_queries, tolerance=0, sizes=QUERY_COUNT_SIZES):
+        """Verifica que recalcular los campos use a lo sumo max_queries consultas en todos los tamaños.
+
+        create_records(size) debe devolver un recordset de ese tamaño. Además
+        de la cota absoluta, el tamaño más grande no puede usar más de
+        tolerance consultas por encima del más chico.
+        """
+        counts = {}
+        for size in sizes:
+            records = create_records(size)
+            self.assertEqual(len(records), size)
+            counts[size] = self._count_compute_queries(records, field_names)
+        
+        label = f"{records._name} ({', '.join(field_names)})"
+        for size, count in counts.items():
+            self.assertLessEqual(
+                count, max_queries,
+                f"{label}: {count} consultas para {size} registros (máximo {max_queries})",
+            )
+        self.assertLessEqual(
+            counts[max(sizes)], counts[min(sizes)] + tolerance,
+            f"{label}: las consultas crecen con la cantidad de registros {counts}",
+        )
+        return counts
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+from odoo.tests import tagged
+
+from .common import ComputeQueryCountCase
+
+
+@tagged('post_install', '-at_install')
+class TestFarmComputeQueryCounts(ComputeQueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.landlord = cls.env['res.partner'].create({'name': 'Arrendador de Prueba'})
+
+    def _create_fields(self, size):
+        fields = self.env['farm.field']
+        for index in range(size):
+            fields |= self._create_farm_field(f'Campo {size}-{index}')
+        self.env['farm.lot'].create([{
+            'name': f'Lote {lot}',
+            'field_id': field.id,
+            'area': 50.0,
+        } for field in fields for lot in range(3)])
+        return fields
+
+    def test_field_total_area(self):
+        self.assertComputeQueries(self._create_fields, ['total_area'], max_queries=4)
+
+    def test_contract_computes(self):
+        def create_contracts(size):
+            fields = self._create_fields(size)
+            return self.env['farm.contract'].create([{
+                'landlord_id': self.landlord.id,
+                'payment_method': 'cash',
+                'start_date': date(2024, 7, 1),
+                'end_date': date(2027, 6, 30),
+                'field_ids': [(6, 0, field.ids)],
+            } for field in fields])
+
+        self.assertComputeQueries(
+            create_contracts, ['name', 'duration', 'field_count', 'total_area'], max_queries=6,
+        )
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+
+from ..models.geometry_mixin import parse_boundary
+from .common import FarmTestCase
+
+# Geometrías GeoJSON con coordenadas que no son listas de anillos
+MALFORMED_GEOMETRIES = (
+    '{"type": "Polygon", "coordinates": null}',
+    '{"type": "Polygon", "coordinates": [null]}',
+    '{"type": "MultiPolygon", "coordinates": [5]}',
+    '{"type": "MultiPolygon", "coordinates": [[5]]}',
+)
+
+
+@tagged('post_install', '-at_install')
+class TestGeometry(FarmTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.farm_field = cls._create_farm_field()
+
+    def test_parse_malformed_geometry(self):
+        for value in MALFORMED_GEOMETRIES:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_boundary(value)
+
+    def test_save_malformed_geometry(self):
+        lot = self.env['farm.lot'].create({'name': 'Lote 1', 'field_id': self.farm_field.id, 'area': 10.0})
+        for value in MALFORMED_GEOMETRIES:
+            with self.subTest(value=value), self.assertRaises(ValidationError):
+                lot.write({'geolocation_points': value})
+
+    def test_import_non_object_feature(self):
+        content = b'{"type": "FeatureCollection", "features": [5, {"type": "Feature", "properties": null}]}'
+        farm_fields, lots, errors = self.env['farm.field'].import_boundaries(
+            content, field_id=self.farm_field.id, skip_errors=True,
+        )
+        self.assertFalse(farm_fields or lots)
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(errors[0].startswith("Elemento 1:"))
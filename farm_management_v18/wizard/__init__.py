@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+from . import farm_boundary_import_wizard
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+import base64
+
+
+class FarmBoundaryImportWizard(models.TransientModel):
+    _name = 'farm.boundary.import.wizard'
+    _description = 'Asistente de Importación de Perímetros'
+
+    boundary_file = fields.Binary(
+        string='Archivo de Perímetros',
+        required=True,
+        help="Exportación GeoJSON (FeatureCollection) o KML de la herramienta GIS"
+    )
+    
+    boundary_file_name = fields.Char(
+        string='Nombre del Archivo'
+    )
+    
+    file_format = fields.Selection([
+        ('auto', 'Detectar automáticamente'),
+        ('geojson', 'GeoJSON'),
+        ('kml', 'KML'),
+    ], string='Formato', default='auto', required=True)
+    
+    field_id = fields.Many2one(
+        'farm.field',
+        string='Campo',
+        help="Si se indica, todos los elementos del archivo se importan como lotes de este campo"
+    )
+    
+    create_lots = fields.Boolean(
+        string='Crear Lotes Nuevos',
+        default=False,
+        help="Crea los lotes que no existen, con la superficie medida como extensión"
+    )
+    
+    skip_errors = fields.Boolean(
+        string='Omitir Elementos con Errores',
+        default=False,
+        help="Importa los elementos válidos e informa el resto. "
+             "Si no se marca, el archivo solo se importa si no hay errores."
+    )
+    
+    # Campos de resultado
+    state = fields.Selection([
+        ('init', 'Configuración'),
+        ('done', 'Completado')
+    ], default='init', string='Estado')
+    
+    imported_count = fields.Integer(
+        string='Perímetros Importados',
+        readonly=True
+    )
+    
+    error_message = fields.Text(
+        string='Elementos Omitidos',
+        readonly=True
+    )
+    
+    farm_field_ids = fields.Many2many(
+        'farm.field',
+        string='Campos Actualizados',
+        readonly=True
+    )
+    
+    lot_ids = fields.Many2many(
+        'farm.lot',
+        string='Lotes Actualizados',
+        readonly=True
+    )
+
+    @api.model
+    def default_get(self, fields_list):
+        """Propone el campo desde el que se abre el asistente"""
+        res = super().default_get(fields_list)
+        if self.env.context.get('active_model') == 'farm.field' and self.env.context.get('active_id'):
+            res.setdefault('field_id', self.env.context['active_id'])
+        return res
+
+    def action_import(self):
+        """Importa los perímetros del archivo"""
+        self.ensure_one()
+        if not self.boundary_file:
+            raise UserError("Debe seleccionar un archivo de perímetros")
+        
+        file_format = self.file_format
+        if file_format == 'auto' and self.boundary_file_name:
+            extension = self.boundary_file_name.rsplit('.', 1)[-1].lower()
+            file_format = {'kml': 'kml', 'geojson': 'geojson', 'json': 'geojson'}.get(extension, 'auto')
+        farm_fields, lots, errors = self.env['farm.field'].import_boundaries(
+            base64.b64decode(self.boundary_file),
+            file_format=None if file_format == 'auto' else file_format,
+            field_id=self.field_id.id,
+            create_lots=self.create_lots,
+            skip_errors=self.skip_errors,
+        )
+        
+        self.write({
+            'state': 'done',
+            'imported_count': len(farm_fields) + len(lots),
+            'error_message': self.env['farm.field']._format_import_errors(errors) if errors else False,
+            'farm_field_ids': [(6, 0, farm_fields.ids)],
+            'lot_ids': [(6, 0, lots.ids)],
+        })
+        
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'farm.boundary.import.wizard',
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new'
+        }
+
+    def action_view_lots(self):
+        """Muestra los lotes importados"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Lotes Importados',
+            'res_model': 'farm.lot',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', self.lot_ids.ids)],
+        }
@@ -52,25 +52,39 @@
     'author': "Equipo de Desarrollo Agropecuario",
     'website': "https://www.ejemplo.com",
     'category': 'Industries',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.0.1',
     'depends': [
         'base',
         'product',
         'farm_management_v18',  # Para integración con campos y lotes
     ],
+    'external_dependencies': {
+        'python': ['numpy'],
+    },
     'data': [
         # Security
         'security/ir.model.access.csv',
         
         # Data
         'data/livestock_breed_data.xml',
+        'data/ir_sequence_data.xml',
+        'data/ir_cron_data.xml',
+        'data/livestock_stock_data.xml',
         
         # Views
         'views/livestock_animal_views.xml',
         'views/livestock_breed_views.xml',
         'views/livestock_event_views.xml',
         'views/livestock_health_log_views.xml',
+        'views/livestock_health_due_views.xml',
         'views/livestock_weighing_views.xml',
+        'views/livestock_stock_views.xml',
+        'views/livestock_movement_views.xml',
+        
+        # Wizards
+        'wizard/livestock_weighing_import_wizard_views.xml',
+        'wizard/livestock_event_bulk_wizard_views.xml',
+        
         'views/menu_views.xml',
     ],
     'demo': [
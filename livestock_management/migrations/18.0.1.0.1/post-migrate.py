@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def _set_lot_log_activity_types(env):
+    """Imputa a una actividad los costos por lote registrados sin ella"""
+    logs = env['livestock.health.log'].search([
+        ('lot_id', '!=', False), ('animal_id', '=', False), ('activity_type', '=', False),
+    ])
+    env.add_to_compute(logs._fields['activity_type'], logs)
+    logs.flush_recordset()
+
+
+def _link_legacy_individual_logs(cr):
+    """Enlaza los registros individuales anteriores con el registro del lote que los generó.
+
+    Antes se creaban sin parent_log_id, justo después del registro del lote,
+    con su misma fecha, tipo y producto. Todos los registros por lote
+    existentes ya generaron sus registros individuales.
+    """
+    cr.execute("""
+        UPDATE livestock_health_log child
+           SET parent_log_id = link.parent_id
+          FROM (SELECT DISTINCT ON (child.id) child.id AS child_id, parent.id AS parent_id
+                  FROM livestock_health_log child
+                  JOIN livestock_health_log parent
+                    ON parent.animal_id IS NULL
+                   AND parent.id < child.id
+                   AND parent.log_type = child.log_type
+                   AND parent.date = child.date
+                   AND parent.product_id IS NOT DISTINCT FROM child.product_id
+                  JOIN farm_lot lot ON lot.id = parent.lot_id
+                 WHERE child.animal_id IS NOT NULL
+                   AND child.parent_log_id IS NULL
+                   AND child.notes = 'Aplicado en lote: ' || lot.name || '. ' || COALESCE(parent.notes, '')
+                 ORDER BY child.id, parent.id DESC) AS link
+         WHERE child.id = link.child_id
+    """)
+    cr.execute("""
+        UPDATE livestock_health_log
+           SET fanout_state = 'done'
+         WHERE lot_id IS NOT NULL AND animal_id IS NULL AND fanout_state IS NULL
+    """)
+
+
+def migrate(cr, version):
+    _link_legacy_individual_logs(cr)
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    _set_lot_log_activity_types(env)
@@ -4,4 +4,9 @@ from . import livestock_breed
 from . import livestock_animal
 from . import livestock_event
 from . import livestock_health_log
-from . import livestock_weighing
\ No newline at end of file
+from . import livestock_health_due
+from . import livestock_weighing
+from . import livestock_stock
+from . import livestock_movement
+from . import farm_field
+from . import farm_lot
\ No newline at end of file
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+
+class FarmField(models.Model):
+    _inherit = 'farm.field'
+
+    livestock_head_count = fields.Integer(
+        string='Cabezas de Ganado',
+        compute='_compute_livestock_head_count',
+        help="Animales activos en el campo"
+    )
+
+    def _compute_livestock_head_count(self):
+        """Lee la cantidad de animales desde las existencias mantenidas"""
+        counts = self.env['livestock.stock'].get_head_counts('field_id', self.ids)
+        for field in self:
+            field.livestock_head_count = counts.get(field.id, 0)
+
+    def unlink(self):
+        """Los animales del campo y de sus lotes quedan sin ubicación: se actualizan sus existencias"""
+        return self.env['livestock.stock']._unlink_with_animals(
+            ['|', ('current_field_id', 'in', self.ids), ('current_lot_id.field_id', 'in', self.ids)],
+            lambda: super(FarmField, self).unlink(),
+        )
+
+    def action_view_livestock(self):
+        """Muestra los animales activos del campo"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Animales del Campo {self.name}',
+            'res_model': 'livestock.animal',
+            'view_mode': 'list,form',
+            'domain': [('current_field_id', '=', self.id), ('status', '=', 'active')],
+        }
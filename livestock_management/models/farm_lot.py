@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+
+class FarmLot(models.Model):
+    _inherit = 'farm.lot'
+
+    livestock_head_count = fields.Integer(
+        string='Cabezas de Ganado',
+        compute='_compute_livestock_head_count',
+        help="Animales activos en el lote"
+    )
+    
+    livestock_stocking_rate = fields.Float(
+        string='Carga Actual (cab/ha)',
+        compute='_compute_livestock_head_count',
+        digits=(16, 2),
+        help="Cabezas de ganado por hectárea del lote"
+    )
+
+    def _compute_livestock_head_count(self):
+        """Lee la cantidad de animales desde las existencias mantenidas"""
+        counts = self.env['livestock.stock'].get_head_counts('lot_id', self.ids)
+        for lot in self:
+            lot.livestock_head_count = counts.get(lot.id, 0)
+            lot.livestock_stocking_rate = lot.livestock_head_count / lot.area if lot.area else 0.0
+
+    def unlink(self):
+        """Los animales del lote quedan sin lote: se actualizan sus existencias"""
+        return self.env['livestock.stock']._unlink_with_animals(
+            [('current_lot_id', 'in', self.ids)], lambda: super(FarmLot, self).unlink(),
+        )
+
+    def get_livestock_occupancy(self, date_from, date_to):
+        """Ocupación y carga promedio de los lotes en el período (libro de movimientos)"""
+        return self.env['livestock.movement.line'].get_lot_occupancy(self.ids, date_from, date_to)
+
+    def action_view_livestock(self):
+        """Muestra los animales activos del lote"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Animales del Lote {self.name}',
+            'res_model': 'livestock.animal',
+            'view_mode': 'list,form',
+            'domain': [('current_lot_id', '=', self.id), ('status', '=', 'active')],
+        }
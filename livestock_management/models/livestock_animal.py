@@ -1,8 +1,62 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
+from collections import Counter, defaultdict
+import logging
+import operator
+
+_logger = logging.getLogger(__name__)
+
+# Campos que ubican al animal en las existencias (livestock.stock)
+STOCK_FIELDS = ('current_field_id', 'current_lot_id', 'breed_id', 'activity_type', 'status', 'active', 'birth_date')
+
+# Conteos de historial: campo calculado -> (modelo, dominio adicional)
+HISTORY_COUNTS = {
+    'total_weighings': ('livestock.weighing', []),
+    'total_health_logs': ('livestock.health.log', []),
+    'total_events': ('livestock.event', []),
+}
+
+# Límite de generaciones recorridas por las consultas de genealogía
+GENEALOGY_MAX_DEPTH = 100
+
+# Recorridos recursivos de la línea materna: (animal de origen, pariente, generación)
+GENEALOGY_QUERIES = {
+    'ancestors': """
+        WITH RECURSIVE tree(origin_id, animal_id, depth) AS (
+            SELECT id, mother_id, 1
+              FROM livestock_animal
+             WHERE id IN %(ids)s AND mother_id IS NOT NULL
+            UNION ALL
+            SELECT tree.origin_id, a.mother_id, tree.depth + 1
+              FROM tree
+              JOIN livestock_animal a ON a.id = tree.animal_id
+             WHERE a.mother_id IS NOT NULL
+               AND tree.animal_id != tree.origin_id
+               AND tree.depth < %(max_depth)s
+        )
+        SELECT origin_id, animal_id, depth FROM tree
+    """,
+    'descendants': """
+        WITH RECURSIVE tree(origin_id, animal_id, depth) AS (
+            SELECT mother_id, id, 1
+              FROM livestock_animal
+             WHERE mother_id IN %(ids)s
+            UNION ALL
+            SELECT tree.origin_id, a.id, tree.depth + 1
+              FROM tree
+              JOIN livestock_animal a ON a.mother_id = tree.animal_id
+             WHERE tree.animal_id != tree.origin_id
+               AND tree.depth < %(max_depth)s
+        )
+        SELECT origin_id, animal_id, depth FROM tree
+    """,
+}
+
+# Campos cuyo cambio se asienta en el libro de movimientos (livestock.movement.line)
+LOCATION_FIELDS = ('current_field_id', 'current_lot_id', 'status', 'active')
 
 
 class LivestockAnimal(models.Model):
@@ -11,6 +65,12 @@ class LivestockAnimal(models.Model):
     _order = 'ear_tag_id'
     _rec_name = 'ear_tag_id'
 
+    _sql_constraints = [
+        ('ear_tag_company_uniq',
+         'EXCLUDE USING btree (COALESCE(company_id, 0) WITH =, ear_tag_id WITH =) WHERE (active)',
+         'Ya existe un animal con ese número de caravana. El número de caravana debe ser único.'),
+    ]
+
     # Información básica del animal
     ear_tag_id = fields.Char(
         string='Número de Caravana',
@@ -39,6 +99,7 @@ class LivestockAnimal(models.Model):
     birth_date = fields.Date(
         string='Fecha de Nacimiento',
         required=True,
+        index=True,
         default=fields.Date.today
     )
     
@@ -49,10 +110,40 @@ class LivestockAnimal(models.Model):
         help="Edad calculada automáticamente"
     )
     
+    age_months = fields.Integer(
+        string='Edad (meses)',
+        compute='_compute_age',
+        store=True,
+        help="Edad en meses cumplidos"
+    )
+    
+    age_days = fields.Integer(
+        string='Edad (días)',
+        compute='_compute_age_days',
+        search='_search_age_days',
+        help="Edad en días (se busca sobre la fecha de nacimiento)"
+    )
+    
+    age_category = fields.Selection([
+        ('calf', 'Ternero (0-6 meses)'),
+        ('weaner', 'Recría (6-12 meses)'),
+        ('yearling', 'Vaquillona/Novillo (12-24 meses)'),
+        ('adult', 'Adulto (más de 24 meses)'),
+    ], string='Categoría de Edad', compute='_compute_age', store=True, index=True)
+    
+    age_refresh_date = fields.Date(
+        string='Próxima Actualización de Edad',
+        compute='_compute_age',
+        store=True,
+        index=True,
+        help="Fecha en la que cambia la edad mostrada; usada por la tarea programada"
+    )
+    
     mother_id = fields.Many2one(
         'livestock.animal',
         string='Madre',
         domain="[('gender', '=', 'female')]",
+        index=True,
         help="Madre del animal"
     )
     
@@ -115,14 +206,41 @@ class LivestockAnimal(models.Model):
         store=True
     )
     
+    target_weight = fields.Float(
+        string='Peso Objetivo (kg)',
+        help="Peso de venta buscado. Si no se indica se usa el peso promedio de la raza según el género"
+    )
+    
+    recent_gdm = fields.Float(
+        string='GDM Reciente (kg/día)',
+        compute='_compute_weight_projection',
+        store=True,
+        digits=(6, 3),
+        help="Tendencia de ganancia diaria de los últimos pesajes"
+    )
+    
+    projected_sale_date = fields.Date(
+        string='Fecha Proyectada de Venta',
+        compute='_compute_weight_projection',
+        store=True,
+        help="Fecha estimada en que el animal alcanza el peso objetivo según su GDM reciente"
+    )
+    
     total_weighings = fields.Integer(
         string='Total de Pesajes',
-        compute='_compute_weighing_stats'
+        compute='_compute_weighing_stats',
+        search='_search_total_weighings'
     )
     
     total_health_logs = fields.Integer(
         string='Registros Sanitarios',
-        compute='_compute_health_stats'
+        compute='_compute_health_stats',
+        search='_search_total_health_logs'
+    )
+    
+    total_events = fields.Integer(
+        string='Eventos',
+        compute='_compute_event_stats'
     )
     
     children_ids = fields.One2many(
@@ -136,6 +254,18 @@ class LivestockAnimal(models.Model):
         compute='_compute_children_count'
     )
     
+    descendant_count = fields.Integer(
+        string='Descendencia Total',
+        compute='_compute_genealogy_stats',
+        help="Crías, nietas y demás descendientes por línea materna"
+    )
+    
+    generation_depth = fields.Integer(
+        string='Generaciones Conocidas',
+        compute='_compute_genealogy_stats',
+        help="Cantidad de generaciones registradas por línea materna"
+    )
+    
     notes = fields.Text(
         string='Observaciones',
         help="Observaciones generales sobre el animal"
@@ -145,18 +275,51 @@ class LivestockAnimal(models.Model):
         string='Activo',
         default=True
     )
+    
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        default=lambda self: self.env.company,
+        index=True
+    )
 
-    # Constrains
-    @api.constrains('ear_tag_id')
-    def _check_ear_tag_unique(self):
-        """Verifica que el número de caravana sea único"""
-        for animal in self:
-            if self.search_count([('ear_tag_id', '=', animal.ear_tag_id), ('id', '!=', animal.id)]) > 0:
-                raise models.ValidationError(
-                    f"Ya existe un animal con el número de caravana '{animal.ear_tag_id}'. "
-                    "El número de caravana debe ser único."
-                )
+    def init(self):
+        """Asigna compañía a los animales anteriores al campo company_id.
+
+        Sin compañía, COALESCE(company_id, 0) del índice de caravanas deja
+        reutilizar su caravana en otra compañía, mientras que
+        check_ear_tag_duplicates la considera compartida. Se toma la
+        compañía del campo actual o, si no tiene, la principal; los animales
+        cuya caravana ya está usada en esa compañía quedan sin asignar.
+        """
+        self.env.cr.execute("""
+            WITH target AS (
+                SELECT a.id, a.ear_tag_id, a.active,
+                       COALESCE(ff.company_id, (SELECT MIN(id) FROM res_company)) AS company_id
+                  FROM livestock_animal a
+                  LEFT JOIN farm_field ff ON ff.id = a.current_field_id
+                 WHERE a.company_id IS NULL
+            )
+            UPDATE livestock_animal a
+               SET company_id = target.company_id
+              FROM target
+             WHERE a.id = target.id
+               AND NOT (target.active AND EXISTS (
+                   SELECT 1
+                     FROM livestock_animal other
+                    WHERE other.active
+                      AND other.company_id = target.company_id
+                      AND other.ear_tag_id = target.ear_tag_id
+               ))
+        """)
+        self.env.cr.execute("SELECT COUNT(*) FROM livestock_animal WHERE company_id IS NULL")
+        pending = self.env.cr.fetchone()[0]
+        if pending:
+            _logger.warning(
+                "%s animales quedaron sin compañía porque su caravana ya existe en la compañía destino", pending
+            )
 
+    # Constrains
     @api.constrains('birth_date')
     def _check_birth_date(self):
         """Verifica que la fecha de nacimiento no sea futura"""
@@ -175,6 +338,14 @@ class LivestockAnimal(models.Model):
                     raise models.ValidationError(
                         "Un animal no puede ser su propia madre."
                     )
+        
+        # Un ciclo aparece cuando el animal figura entre sus propios ancestros
+        cycles = [origin for origin, ancestor, depth in self._read_genealogy('ancestors') if origin == ancestor]
+        if cycles:
+            animal = self.browse(cycles[0])
+            raise models.ValidationError(
+                f"El animal {animal.ear_tag_id} no puede ser ancestro de sí mismo."
+            )
 
     # Campos calculados
     @api.depends('birth_date')
@@ -195,8 +366,64 @@ class LivestockAnimal(models.Model):
                     animal.age = f"{diff.months} meses"
                 else:
                     animal.age = f"{diff.days} días"
+                
+                months = diff.years * 12 + diff.months
+                animal.age_months = months
+                animal.age_category = self._get_age_category(months)
+                # La edad en días cambia a diario; la de meses, en cada mes cumplido
+                if months:
+                    animal.age_refresh_date = birth + relativedelta(months=months + 1)
+                else:
+                    animal.age_refresh_date = today + timedelta(days=1)
             else:
                 animal.age = "Sin fecha de nacimiento"
+                animal.age_months = 0
+                animal.age_category = False
+                animal.age_refresh_date = False
+
+    @api.model
+    def _get_age_category(self, months):
+        """Devuelve la categoría de edad según los meses cumplidos"""
+        if months < 6:
+            return 'calf'
+        if months < 12:
+            return 'weaner'
+        if months < 24:
+            return 'yearling'
+        return 'adult'
+
+    @api.depends('birth_date')
+    def _compute_age_days(self):
+        """Calcula la edad en días"""
+        today = date.today()
+        for animal in self:
+            animal.age_days = (today - animal.birth_date).days if animal.birth_date else 0
+
+    def _search_age_days(self, operator, value):
+        """Traduce la búsqueda por edad en días a la fecha de nacimiento (indexada)"""
+        inverse_operators = {'=': '=', '!=': '!=', '>': '<', '>=': '<=', '<': '>', '<=': '>='}
+        if operator not in inverse_operators:
+            raise models.UserError(f"Operador no soportado para la edad en días: {operator}")
+        birth_date = date.today() - timedelta(days=int(value))
+        return [('birth_date', inverse_operators[operator], birth_date)]
+
+    @api.model
+    def _cron_refresh_age(self):
+        """Actualiza la edad solo de los animales cuya edad mostrada cambió desde la última ejecución"""
+        animals = self.with_context(active_test=False).search([
+            ('age_refresh_date', '<=', date.today()),
+        ])
+        if not animals:
+            return True
+        delta = Counter({key: -count for key, count in animals._get_stock_keys().items()})
+        for fname in ('age', 'age_months', 'age_category', 'age_refresh_date'):
+            self.env.add_to_compute(self._fields[fname], animals)
+        animals.flush_recordset(['age', 'age_months', 'age_category', 'age_refresh_date'])
+        
+        # Los animales que cambian de categoría de edad pasan a otra fila de existencias
+        delta.update(animals._get_stock_keys())
+        self.env['livestock.stock']._apply_delta(delta)
+        return True
 
     @api.depends('weighing_ids.weight_kg', 'weighing_ids.date')
     def _compute_current_weight(self):
@@ -210,23 +437,162 @@ class LivestockAnimal(models.Model):
                 animal.current_weight = 0.0
                 animal.last_weighing_date = False
 
+    @api.depends('weighing_ids.weight_kg', 'weighing_ids.date', 'target_weight', 'gender',
+                 'breed_id.average_weight_male', 'breed_id.average_weight_female')
+    def _compute_weight_projection(self):
+        """Proyecta la fecha de venta de todo el recordset con una sola lectura de pesajes"""
+        animals = self.filtered('id')
+        projections = self.env['livestock.weighing'].get_weight_projections({
+            animal.id: animal._get_target_weight() for animal in animals
+        }) if animals else {}
+        for animal in self:
+            projection = projections.get(animal.id, {})
+            animal.recent_gdm = projection.get('gdm', 0.0)
+            animal.projected_sale_date = projection.get('target_date', False)
+
+    def _get_target_weight(self):
+        """Peso objetivo del animal o, en su defecto, el promedio de la raza"""
+        self.ensure_one()
+        if self.target_weight:
+            return self.target_weight
+        if self.gender == 'male':
+            return self.breed_id.average_weight_male
+        return self.breed_id.average_weight_female
+
+    def get_weight_at(self, on_date, extrapolate=False):
+        """Devuelve {animal_id: peso interpolado} en la fecha indicada para todo el recordset"""
+        weights = self.env['livestock.weighing'].get_weights_at(self.ids, [on_date], extrapolate=extrapolate)
+        return {animal_id: values[0] for animal_id, values in weights.items()}
+
+    def _read_history_counts(self, fname):
+        """Cuenta los registros de historial del recordset con una consulta agrupada"""
+        comodel, domain = HISTORY_COUNTS[fname]
+        if not self.ids:
+            return {}
+        groups = self.env[comodel]._read_group(
+            [('animal_id', 'in', self.ids)] + domain, ['animal_id'], ['__count'],
+        )
+        return {animal.id: count for animal, count in groups}
+
+    def _search_history_count(self, fname, operator_name, value):
+        """Filtra animales por cantidad de registros de historial sin calcularla por animal"""
+        operators = {
+            '=': operator.eq, '!=': operator.ne, '>': operator.gt,
+            '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+        }
+        if operator_name not in operators:
+            raise models.UserError(f"Operador no soportado para el conteo de historial: {operator_name}")
+        comparison = operators[operator_name]
+        comodel, domain = HISTORY_COUNTS[fname]
+        groups = self.env[comodel]._read_group(domain, ['animal_id'], ['__count'])
+        if comparison(0, value):
+            # Los animales sin historial cumplen la condición: se excluyen los que no
+            return [('id', 'not in', [animal.id for animal, count in groups if not comparison(count, value)])]
+        return [('id', 'in', [animal.id for animal, count in groups if comparison(count, value)])]
+
     @api.depends('weighing_ids')
     def _compute_weighing_stats(self):
         """Calcula estadísticas de pesajes"""
+        counts = self._read_history_counts('total_weighings')
         for animal in self:
-            animal.total_weighings = len(animal.weighing_ids)
+            animal.total_weighings = counts.get(animal.id, 0)
+
+    def _search_total_weighings(self, operator_name, value):
+        return self._search_history_count('total_weighings', operator_name, value)
 
     @api.depends('health_log_ids')
     def _compute_health_stats(self):
         """Calcula estadísticas sanitarias"""
+        counts = self._read_history_counts('total_health_logs')
+        for animal in self:
+            animal.total_health_logs = counts.get(animal.id, 0)
+
+    def _search_total_health_logs(self, operator_name, value):
+        return self._search_history_count('total_health_logs', operator_name, value)
+
+    @api.depends('event_ids')
+    def _compute_event_stats(self):
+        """Calcula la cantidad de eventos de vida"""
+        counts = self._read_history_counts('total_events')
         for animal in self:
-            animal.total_health_logs = len(animal.health_log_ids)
+            animal.total_events = counts.get(animal.id, 0)
 
-    @api.depends('children_ids')
+    @api.depends('children_ids.status')
     def _compute_children_count(self):
         """Calcula la cantidad de crías"""
+        counts = {}
+        if self.ids:
+            groups = self._read_group(
+                [('mother_id', 'in', self.ids), ('status', '=', 'active')], ['mother_id'], ['__count'],
+            )
+            counts = {mother.id: count for mother, count in groups}
+        for animal in self:
+            animal.children_count = counts.get(animal.id, 0)
+
+    def _read_genealogy(self, direction, max_depth=GENEALOGY_MAX_DEPTH):
+        """Recorre la línea materna con una sola consulta recursiva.
+
+        direction es 'ancestors' o 'descendants'; devuelve una lista de
+        (animal de origen, pariente, generación).
+        """
+        animals = self.filtered('id')
+        if not animals:
+            return []
+        self.flush_model(['mother_id'])
+        self.env.cr.execute(GENEALOGY_QUERIES[direction], {
+            'ids': tuple(animals.ids),
+            'max_depth': max_depth,
+        })
+        return self.env.cr.fetchall()
+
+    def get_ancestors(self, max_depth=GENEALOGY_MAX_DEPTH):
+        """Devuelve todos los ancestros por línea materna del recordset"""
+        return self.browse({ancestor for origin, ancestor, depth in self._read_genealogy('ancestors', max_depth)})
+
+    def get_descendants(self, max_depth=GENEALOGY_MAX_DEPTH):
+        """Devuelve todos los descendientes por línea materna del recordset"""
+        return self.browse({child for origin, child, depth in self._read_genealogy('descendants', max_depth)})
+
+    def _compute_genealogy_stats(self):
+        """Calcula descendencia y profundidad genealógica con una consulta por sentido"""
+        descendants = defaultdict(int)
+        for origin, child, depth in self._read_genealogy('descendants'):
+            descendants[origin] += 1
+        generations = defaultdict(int)
+        for origin, ancestor, depth in self._read_genealogy('ancestors'):
+            generations[origin] = max(generations[origin], depth)
         for animal in self:
-            animal.children_count = len(animal.children_ids.filtered(lambda c: c.status == 'active'))
+            animal.descendant_count = descendants[animal.id]
+            animal.generation_depth = generations[animal.id]
+
+    @api.model
+    def get_cow_families(self, max_depth=GENEALOGY_MAX_DEPTH):
+        """Analiza las familias de vacas de todo el rodeo en una sola consulta.
+
+        Devuelve {fundadora: {'descendants': cantidad, 'generations': profundidad}}
+        para cada hembra sin madre registrada que tenga descendencia.
+        """
+        self.flush_model(['mother_id'])
+        self.env.cr.execute("""
+            WITH RECURSIVE tree(root_id, animal_id, depth) AS (
+                SELECT id, id, 0
+                  FROM livestock_animal
+                 WHERE mother_id IS NULL
+                UNION ALL
+                SELECT tree.root_id, a.id, tree.depth + 1
+                  FROM tree
+                  JOIN livestock_animal a ON a.mother_id = tree.animal_id
+                 WHERE tree.depth < %s
+            )
+            SELECT root_id, COUNT(*) - 1, MAX(depth)
+              FROM tree
+             GROUP BY root_id
+            HAVING COUNT(*) > 1
+        """, [max_depth])
+        return {
+            root_id: {'descendants': descendants, 'generations': generations}
+            for root_id, descendants, generations in self.env.cr.fetchall()
+        }
 
     def name_get(self):
         """Personaliza la visualización del nombre"""
@@ -240,19 +606,190 @@ class LivestockAnimal(models.Model):
         return result
 
     @api.model
-    def create(self, vals):
+    def check_ear_tag_duplicates(self, ear_tags, company_id=None, record_ids=None):
+        """Valida en una sola pasada las caravanas de un archivo antes de importarlo.
+
+        record_ids indica, por fila, el animal que actualiza (o False si es
+        un alta): una fila que conserva la caravana de su propio animal no
+        es un conflicto. Devuelve solo las caravanas en conflicto:
+        {caravana: {'rows': [posiciones en el archivo], 'animal_id': animal existente o False}}
+        """
+        company_id = company_id or self.env.company.id
+        ear_tags = list(ear_tags)
+        record_ids = list(record_ids) if record_ids is not None else [False] * len(ear_tags)
+        rows_by_tag = defaultdict(list)
+        for row, ear_tag in enumerate(ear_tags):
+            if ear_tag:
+                rows_by_tag[ear_tag].append(row)
+        if not rows_by_tag:
+            return {}
+
+        existing = defaultdict(set)
+        for animal in self.search_read([
+            ('ear_tag_id', 'in', list(rows_by_tag)),
+            ('company_id', 'in', [company_id, False]),
+        ], ['ear_tag_id']):
+            existing[animal['ear_tag_id']].add(animal['id'])
+
+        duplicates = {}
+        for ear_tag, rows in rows_by_tag.items():
+            others = existing.get(ear_tag, set()) - {record_ids[row] for row in rows}
+            if len(rows) > 1 or others:
+                duplicates[ear_tag] = {'rows': rows, 'animal_id': min(others) if others else False}
+        return duplicates
+
+    @api.model
+    def _get_import_record_ids(self, fields, data):
+        """Animal que actualiza cada fila del archivo, según la columna id o .id (False si es un alta)"""
+        if '.id' in fields:
+            index = fields.index('.id')
+            return [int(row[index]) if row[index] else False for row in data]
+        if 'id' not in fields:
+            return [False] * len(data)
+        index = fields.index('id')
+        # Los identificadores externos sin módulo son los del importador (__import__)
+        xmlids = []
+        for row in data:
+            xmlid = row[index]
+            if not xmlid:
+                xmlids.append(False)
+            else:
+                xmlids.append(tuple(xmlid.split('.', 1)) if '.' in xmlid else ('__import__', xmlid))
+        res_ids = {
+            (imd['module'], imd['name']): imd['res_id']
+            for imd in self.env['ir.model.data'].sudo().search_read([
+                ('model', '=', self._name),
+                ('name', 'in', [xmlid[1] for xmlid in xmlids if xmlid]),
+            ], ['module', 'name', 'res_id'])
+        }
+        return [res_ids.get(xmlid, False) if xmlid else False for xmlid in xmlids]
+
+    @api.model
+    def load(self, fields, data):
+        """Informa todas las caravanas duplicadas del archivo antes de importar"""
+        if 'ear_tag_id' in fields:
+            index = fields.index('ear_tag_id')
+            duplicates = self.check_ear_tag_duplicates(
+                [row[index] for row in data], record_ids=self._get_import_record_ids(fields, data),
+            )
+            if duplicates:
+                messages = []
+                for ear_tag, info in duplicates.items():
+                    if info['animal_id']:
+                        message = f"Ya existe un animal con el número de caravana '{ear_tag}'."
+                    else:
+                        message = f"El número de caravana '{ear_tag}' está repetido en el archivo."
+                    for row in info['rows']:
+                        messages.append({
+                            'type': 'error',
+                            'message': message,
+                            'field': 'ear_tag_id',
+                            'record': row,
+                            'rows': {'from': row, 'to': row},
+                        })
+                return {'ids': False, 'messages': messages}
+        return super(LivestockAnimal, self).load(fields, data)
+
+    @api.model_create_multi
+    def create(self, vals_list):
         """Sobrescribe create para validaciones adicionales"""
-        animal = super(LivestockAnimal, self).create(vals)
+        animals = super(LivestockAnimal, self).create(vals_list)
+        self.env['livestock.stock']._apply_delta(animals._get_stock_keys())
+        animals._log_location_changes({})
         
-        # Crear evento de nacimiento automáticamente
-        self.env['livestock.event'].create({
+        # Crear eventos de nacimiento automáticamente, todos en un solo create
+        self.env['livestock.event'].create([{
             'event_type': 'birth',
             'date': animal.birth_date,
             'animal_id': animal.id,
             'notes': f'Nacimiento registrado automáticamente para {animal.ear_tag_id}'
-        })
+        } for animal in animals])
         
-        return animal
+        return animals
+
+    def write(self, vals):
+        """Sobrescribe write para mantener las existencias y el libro de movimientos"""
+        track_stock = any(fname in vals for fname in STOCK_FIELDS)
+        track_location = (
+            any(fname in vals for fname in LOCATION_FIELDS)
+            and not self.env.context.get('livestock_skip_movement_ledger')
+        )
+        if not track_stock and not track_location:
+            return super(LivestockAnimal, self).write(vals)
+        
+        delta = Counter({key: -count for key, count in self._get_stock_keys().items()}) if track_stock else None
+        locations = self._get_locations() if track_location else None
+        result = super(LivestockAnimal, self).write(vals)
+        if track_stock:
+            delta.update(self._get_stock_keys())
+            self.env['livestock.stock']._apply_delta(delta)
+        if track_location:
+            self._log_location_changes(locations)
+        return result
+
+    def unlink(self):
+        """Sobrescribe unlink para descontar los animales de las existencias"""
+        delta = Counter({key: -count for key, count in self._get_stock_keys().items()})
+        result = super(LivestockAnimal, self).unlink()
+        self.env['livestock.stock']._apply_delta(delta)
+        return result
+
+    def _get_locations(self):
+        """Devuelve {animal: (campo, lote)} de los animales activos"""
+        return {
+            animal.id: (animal.current_field_id.id, animal.current_lot_id.id)
+            for animal in self
+            if animal.status == 'active' and animal.active
+        }
+
+    def _log_location_changes(self, previous_locations):
+        """Asienta en el libro de movimientos, en un solo create, los cambios de ubicación.
+
+        La fecha es la de la clave livestock_movement_date del contexto, que
+        fijan los eventos y movimientos registrados con fecha anterior; si no
+        se indica, la de hoy.
+        """
+        move_date = (
+            fields.Date.to_date(self.env.context.get('livestock_movement_date'))
+            or fields.Date.context_today(self)
+        )
+        current_locations = self._get_locations()
+        vals_list = []
+        for animal in self:
+            before = previous_locations.get(animal.id)
+            after = current_locations.get(animal.id)
+            if before == after or not any(before or ()) and not any(after or ()):
+                continue
+            if not after:
+                move_type = 'exit'
+            elif not before:
+                move_type = 'entry'
+            else:
+                move_type = 'transfer'
+            vals_list.append({
+                'animal_id': animal.id,
+                'date': move_date,
+                'move_type': move_type,
+                'from_field_id': before[0] if before else False,
+                'from_lot_id': before[1] if before else False,
+                'to_field_id': after[0] if after else False,
+                'to_lot_id': after[1] if after else False,
+            })
+        self.env['livestock.movement.line'].create(vals_list)
+
+    def _get_stock_keys(self):
+        """Cuenta los animales activos por clave de existencias (campo, lote, raza, actividad, edad)"""
+        return Counter(
+            (
+                animal.current_field_id.id or None,
+                animal.current_lot_id.id or None,
+                animal.breed_id.id or None,
+                animal.activity_type or None,
+                animal.age_category or None,
+            )
+            for animal in self
+            if animal.status == 'active' and animal.active
+        )
 
     def action_mark_as_sold(self):
         """Marca el animal como vendido"""
@@ -306,6 +843,42 @@ class LivestockAnimal(models.Model):
             }
         }
 
+    def action_view_descendants(self):
+        """Muestra toda la descendencia del animal"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Descendencia de {self.ear_tag_id}',
+            'res_model': 'livestock.animal',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', self.get_descendants().ids)],
+            'context': {'active_test': False},
+        }
+
+    def action_view_ancestors(self):
+        """Muestra los ancestros por línea materna del animal"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Ancestros de {self.ear_tag_id}',
+            'res_model': 'livestock.animal',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', self.get_ancestors().ids)],
+            'context': {'active_test': False},
+        }
+
+    def action_view_events(self):
+        """Muestra los eventos de vida del animal"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Eventos de {self.ear_tag_id}',
+            'res_model': 'livestock.event',
+            'view_mode': 'list,form',
+            'domain': [('animal_id', '=', self.id)],
+            'context': {'default_animal_id': self.id},
+        }
+
     def action_view_children(self):
         """Muestra las crías del animal"""
         self.ensure_one()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
+import operator
 
 
 class LivestockBreed(models.Model):
@@ -50,7 +51,7 @@ class LivestockBreed(models.Model):
     animal_count = fields.Integer(
         string='Cantidad de Animales',
         compute='_compute_animal_count',
-        store=True
+        search='_search_animal_count'
     )
     
     active = fields.Boolean(
@@ -58,14 +59,33 @@ class LivestockBreed(models.Model):
         default=True
     )
 
-    @api.depends('name')
     def _compute_animal_count(self):
-        """Calcula la cantidad de animales de cada raza"""
+        """Calcula la cantidad de animales activos de cada raza desde las existencias"""
+        counts = self.env['livestock.stock'].get_head_counts('breed_id', self.ids)
         for breed in self:
-            breed.animal_count = self.env['livestock.animal'].search_count([
-                ('breed_id', '=', breed.id),
-                ('status', '=', 'active')
-            ])
+            breed.animal_count = counts.get(breed.id, 0)
+
+    def _search_animal_count(self, operator_name, value):
+        """Permite filtrar razas por cantidad de animales usando las existencias"""
+        operators = {
+            '=': operator.eq, '!=': operator.ne, '>': operator.gt,
+            '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+        }
+        if operator_name not in operators:
+            raise models.UserError(f"Operador no soportado para la cantidad de animales: {operator_name}")
+        breeds = self.with_context(active_test=False).search([])
+        counts = self.env['livestock.stock'].get_head_counts('breed_id', breeds.ids)
+        matching = [
+            breed_id for breed_id in breeds.ids
+            if operators[operator_name](counts.get(breed_id, 0), value)
+        ]
+        return [('id', 'in', matching)]
+
+    def unlink(self):
+        """Mantiene las existencias al eliminar razas"""
+        return self.env['livestock.stock']._unlink_with_animals(
+            [('breed_id', 'in', self.ids)], lambda: super(LivestockBreed, self).unlink(),
+        )
 
     def name_get(self):
         """Personaliza la visualización del nombre"""
@@ -2,15 +2,23 @@
 
 from odoo import models, fields, api
 
+# Estado en el que queda el animal al registrar cada tipo de evento
+EVENT_ANIMAL_STATUS = {
+    'death': 'dead',
+    'sale': 'sold',
+}
+
 
 class LivestockEvent(models.Model):
     _name = 'livestock.event'
+    _inherit = ['farm.selection.label.mixin']
     _description = 'Eventos de Vida del Ganado'
     _order = 'date desc, id desc'
 
     event_type = fields.Selection([
         ('birth', 'Nacimiento'),
         ('death', 'Mortandad'),
+        ('sale', 'Venta'),
     ], string='Tipo de Evento', required=True)
     
     date = fields.Date(
@@ -23,6 +31,7 @@ class LivestockEvent(models.Model):
         'livestock.animal',
         string='Animal',
         required=True,
+        index=True,
         help="Animal afectado por el evento"
     )
     
@@ -57,18 +66,15 @@ class LivestockEvent(models.Model):
         store=True,
         readonly=True
     )
-    
-    # Campo para el nombre compuesto
-    display_name = fields.Char(
-        string='Descripción',
-        compute='_compute_display_name',
-        store=True
-    )
 
     @api.depends('event_type', 'animal_id.ear_tag_id', 'date')
     def _compute_display_name(self):
-        """Calcula el nombre para mostrar del evento"""
-        event_types = dict(self._fields['event_type'].selection)
+        """Calcula el nombre para mostrar del evento.
+
+        No se almacena: se arma al leer, así renombrar una caravana no reescribe
+        el historial de eventos del animal.
+        """
+        event_types = self._get_selection_labels('event_type')
         for event in self:
             if event.animal_id and event.event_type:
                 event.display_name = f"{event_types[event.event_type]} - {event.animal_id.ear_tag_id} ({event.date})"
@@ -94,43 +100,50 @@ class LivestockEvent(models.Model):
                     "que está marcado como muerto."
                 )
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Sobrescribe create para manejar eventos especiales"""
-        event = super(LivestockEvent, self).create(vals)
+        events = super(LivestockEvent, self).create(vals_list)
         
-        # Si es un evento de muerte, actualizar el estado del animal
-        if event.event_type == 'death' and event.animal_id:
-            event.animal_id.status = 'dead'
-            
-        # Si es un evento de nacimiento y se crea manualmente, validar
-        elif event.event_type == 'birth' and event.animal_id:
-            # Verificar que el animal no tenga ya un evento de nacimiento
-            existing_birth = self.search([
-                ('animal_id', '=', event.animal_id.id),
-                ('event_type', '=', 'birth'),
-                ('id', '!=', event.id)
-            ])
-            if existing_birth:
-                raise models.ValidationError(
-                    f"El animal {event.animal_id.ear_tag_id} ya tiene un evento de nacimiento registrado."
-                )
+        # Bajas y ventas: actualizar el estado de todos los animales con una escritura
+        # por tipo y fecha; el libro de movimientos asienta el egreso en la fecha del evento
+        for event_type, status in EVENT_ANIMAL_STATUS.items():
+            typed_events = events.filtered(lambda e: e.event_type == event_type)
+            for event_date, date_events in typed_events.grouped('date').items():
+                date_events.animal_id.with_context(livestock_movement_date=event_date).write({'status': status})
+        
+        # Verificar que los animales no tengan ya un evento de nacimiento
+        events.filtered(lambda e: e.event_type == 'birth' and e.animal_id)._check_unique_birth()
         
-        return event
+        return events
+
+    def _check_unique_birth(self):
+        """Verifica con una sola consulta que cada animal tenga un único nacimiento"""
+        if not self:
+            return
+        self.flush_model(['animal_id', 'event_type'])
+        self.env.cr.execute("""
+            SELECT animal_id
+              FROM livestock_event
+             WHERE event_type = 'birth'
+               AND animal_id IN %s
+             GROUP BY animal_id
+            HAVING COUNT(*) > 1
+             LIMIT 1
+        """, [tuple(self.animal_id.ids)])
+        row = self.env.cr.fetchone()
+        if row:
+            animal = self.env['livestock.animal'].browse(row[0])
+            raise models.ValidationError(
+                f"El animal {animal.ear_tag_id} ya tiene un evento de nacimiento registrado."
+            )
 
     @api.model
     def create_birth_from_animal(self, animal_vals):
         """Método para crear un animal con evento de nacimiento"""
-        # Primero crear el animal
+        # El animal genera su evento de nacimiento al crearse
         animal = self.env['livestock.animal'].create(animal_vals)
-        
-        # Crear el evento de nacimiento
-        birth_event = self.create({
-            'event_type': 'birth',
-            'date': animal.birth_date,
-            'animal_id': animal.id,
-            'notes': f'Nacimiento de {animal.ear_tag_id}'
-        })
+        birth_event = animal.event_ids.filtered(lambda e: e.event_type == 'birth')
         
         return animal, birth_event
 
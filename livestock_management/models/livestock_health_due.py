@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, tools
+
+
+class LivestockHealthDue(models.Model):
+    _name = 'livestock.health.due'
+    _description = 'Calendario Sanitario'
+    _auto = False
+    _order = 'date, lot_id'
+
+    date = fields.Date(
+        string='Fecha de Aplicación',
+        readonly=True
+    )
+    
+    lot_id = fields.Many2one(
+        'farm.lot',
+        string='Lote',
+        readonly=True
+    )
+    
+    field_id = fields.Many2one(
+        'farm.field',
+        string='Campo',
+        readonly=True
+    )
+    
+    log_type = fields.Selection(
+        selection=lambda self: self.env['livestock.health.log']._fields['log_type'].selection,
+        string='Tipo de Control',
+        readonly=True
+    )
+    
+    product_id = fields.Many2one(
+        'product.product',
+        string='Producto',
+        readonly=True
+    )
+    
+    scheduled = fields.Boolean(
+        string='Programada',
+        readonly=True,
+        help="Ya se generó el registro planificado de la aplicación"
+    )
+    
+    log_count = fields.Integer(
+        string='Registros',
+        readonly=True
+    )
+    
+    animal_count = fields.Integer(
+        string='Cabezas',
+        readonly=True
+    )
+
+    def init(self):
+        """Agrupa por fecha, lote, tipo y producto las próximas aplicaciones pendientes"""
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT MIN(l.id) AS id,
+                       l.next_application_date AS date,
+                       COALESCE(l.lot_id, a.current_lot_id) AS lot_id,
+                       fl.field_id AS field_id,
+                       l.log_type AS log_type,
+                       l.product_id AS product_id,
+                       l.next_log_id IS NOT NULL AS scheduled,
+                       COUNT(*) AS log_count,
+                       SUM(l.animal_count) AS animal_count
+                  FROM livestock_health_log l
+                  LEFT JOIN livestock_animal a ON a.id = l.animal_id
+                  LEFT JOIN farm_lot fl ON fl.id = COALESCE(l.lot_id, a.current_lot_id)
+                 WHERE l.next_application_date IS NOT NULL
+                   AND l.parent_log_id IS NULL
+                   AND l.state != 'planned'
+                 GROUP BY l.next_application_date, COALESCE(l.lot_id, a.current_lot_id), fl.field_id,
+                          l.log_type, l.product_id, l.next_log_id IS NOT NULL
+            )
+        """)
+
+    @api.model
+    def get_due_treatments(self, date_from=None, date_to=None, lot_ids=None):
+        """Devuelve las aplicaciones que vencen en el período, agrupadas por fecha y lote.
+
+        Una sola consulta agrupada sobre la cola indexada de próximas aplicaciones.
+        """
+        domain = []
+        if date_from:
+            domain.append(('date', '>=', date_from))
+        if date_to:
+            domain.append(('date', '<=', date_to))
+        if lot_ids:
+            domain.append(('lot_id', 'in', list(lot_ids)))
+        groups = self._read_group(
+            domain, ['date:day', 'lot_id', 'log_type', 'product_id'],
+            ['animal_count:sum', 'log_count:sum'],
+        )
+        return [{
+            'date': date,
+            'lot_id': lot.id,
+            'log_type': log_type,
+            'product_id': product.id,
+            'animal_count': animal_count,
+            'log_count': log_count,
+        } for date, lot, log_type, product, animal_count, log_count in groups]
+
+    def action_view_logs(self):
+        """Muestra los registros sanitarios que originan la aplicación"""
+        self.ensure_one()
+        domain = [
+            ('next_application_date', '=', self.date),
+            ('log_type', '=', self.log_type),
+            ('product_id', '=', self.product_id.id),
+            ('parent_log_id', '=', False),
+            ('state', '!=', 'planned'),
+            '|', ('lot_id', '=', self.lot_id.id),
+            '&', ('lot_id', '=', False), ('animal_id.current_lot_id', '=', self.lot_id.id),
+        ]
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Registros a Reaplicar',
+            'res_model': 'livestock.health.log',
+            'view_mode': 'list,form',
+            'domain': domain,
+        }
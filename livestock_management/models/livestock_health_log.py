@@ -1,10 +1,31 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+from datetime import timedelta
+from collections import defaultdict
+
+# Lotes de hasta esta cantidad de animales se procesan en la misma transacción;
+# los más grandes se completan en segundo plano por tandas
+FANOUT_SYNC_LIMIT = 5000
+FANOUT_CHUNK_SIZE = 1000
+
+# Días hacia adelante en que el calendario sanitario programa las próximas aplicaciones
+DUE_SCHEDULE_HORIZON_DAYS = 14
+
+# Agrupaciones de get_cost_rollup y el campo almacenado que usa cada una
+COST_ROLLUP_GROUPBY = {
+    'lot': 'cost_lot_id',
+    'field': 'cost_field_id',
+    'product': 'product_id',
+    'month': 'date:month',
+    'activity_type': 'activity_type',
+    'log_type': 'log_type',
+}
 
 
 class LivestockHealthLog(models.Model):
     _name = 'livestock.health.log'
+    _inherit = ['farm.selection.label.mixin']
     _description = 'Registro Sanitario del Ganado'
     _order = 'date desc, id desc'
 
@@ -85,18 +106,52 @@ class LivestockHealthLog(models.Model):
         help="Cantidad de animales tratados"
     )
     
+    unit_cost = fields.Float(
+        string='Costo del Producto',
+        compute='_compute_unit_cost',
+        store=True,
+        readonly=False,
+        digits='Product Price',
+        help="Costo del producto al momento de la aplicación"
+    )
+    
     cost_per_animal = fields.Float(
         string='Costo por Animal',
         compute='_compute_cost_per_animal',
+        store=True,
         help="Costo estimado por animal"
     )
     
     total_cost = fields.Float(
         string='Costo Total',
         compute='_compute_total_cost',
+        store=True,
         help="Costo total del tratamiento"
     )
     
+    # Ubicación y actividad al momento de la aplicación, para los informes de costos
+    cost_lot_id = fields.Many2one(
+        'farm.lot',
+        string='Lote de Imputación',
+        compute='_compute_cost_location',
+        store=True,
+        help="Lote del animal o lote tratado al registrar la aplicación"
+    )
+    
+    cost_field_id = fields.Many2one(
+        'farm.field',
+        string='Campo de Imputación',
+        compute='_compute_cost_location',
+        store=True
+    )
+    
+    activity_type = fields.Selection(
+        selection=lambda self: self.env['livestock.animal']._fields['activity_type'].selection,
+        string='Tipo de Actividad',
+        compute='_compute_cost_location',
+        store=True
+    )
+    
     # Control de estado
     state = fields.Selection([
         ('planned', 'Planificado'),
@@ -108,6 +163,42 @@ class LivestockHealthLog(models.Model):
         string='Próxima Aplicación',
         help="Fecha sugerida para la próxima aplicación (refuerzos)"
     )
+    
+    next_log_id = fields.Many2one(
+        'livestock.health.log',
+        string='Aplicación Programada',
+        readonly=True,
+        copy=False,
+        ondelete='set null',
+        help="Registro planificado generado para la próxima aplicación"
+    )
+    
+    # Registros individuales generados desde un registro por lote
+    parent_log_id = fields.Many2one(
+        'livestock.health.log',
+        string='Registro del Lote',
+        index=True,
+        ondelete='cascade',
+        readonly=True,
+        help="Registro por lote que originó este registro individual"
+    )
+    
+    individual_log_ids = fields.One2many(
+        'livestock.health.log',
+        'parent_log_id',
+        string='Registros Individuales'
+    )
+    
+    individual_log_count = fields.Integer(
+        string='Registros Generados',
+        compute='_compute_individual_log_count'
+    )
+    
+    fanout_state = fields.Selection([
+        ('done', 'Generados'),
+        ('pending', 'En Proceso'),
+    ], string='Registros Individuales', readonly=True, copy=False,
+       help="Estado de la generación de registros individuales de un lote grande")
 
     @api.constrains('animal_id', 'lot_id')
     def _check_animal_or_lot(self):
@@ -123,37 +214,66 @@ class LivestockHealthLog(models.Model):
                     "Elija una opción."
                 )
 
-    @api.constrains('date')
+    @api.constrains('date', 'state')
     def _check_date(self):
-        """Valida que la fecha no sea futura"""
+        """Valida que la fecha no sea futura, salvo en aplicaciones planificadas"""
         for log in self:
-            if log.date and log.date > fields.Date.today():
+            if log.date and log.date > fields.Date.today() and log.state != 'planned':
                 raise models.ValidationError(
                     "La fecha de aplicación no puede ser futura."
                 )
 
+    def init(self):
+        """Índices de la cola de próximas aplicaciones y de los informes de costos"""
+        tools.create_index(
+            self.env.cr, 'livestock_health_log_due_queue_index', self._table,
+            ['next_application_date', 'state', 'lot_id'],
+            where='next_application_date IS NOT NULL AND parent_log_id IS NULL',
+        )
+        tools.create_index(
+            self.env.cr, 'livestock_health_log_cost_rollup_index', self._table,
+            ['date', 'cost_lot_id', 'product_id'],
+            where='parent_log_id IS NULL',
+        )
+
     @api.depends('animal_id', 'lot_id')
     def _compute_animal_count(self):
         """Calcula la cantidad de animales tratados"""
+        lot_logs = self.filtered(lambda log: log.lot_id and not log.animal_id)
+        counts = {}
+        if lot_logs:
+            # Animales activos de todos los lotes, desde las existencias mantenidas
+            counts = self.env['livestock.stock'].get_head_counts('lot_id', lot_logs.lot_id.ids)
         for log in self:
             if log.animal_id:
                 log.animal_count = 1
             elif log.lot_id:
-                # Contar animales activos en el lote
-                log.animal_count = self.env['livestock.animal'].search_count([
-                    ('current_lot_id', '=', log.lot_id.id),
-                    ('status', '=', 'active')
-                ])
+                log.animal_count = counts.get(log.lot_id.id, 0)
             else:
                 log.animal_count = 0
 
-    @api.depends('product_id', 'dose')
+    def _compute_individual_log_count(self):
+        """Cuenta los registros individuales generados por cada registro de lote"""
+        groups = self._read_group(
+            [('parent_log_id', 'in', self.ids)], ['parent_log_id'], ['__count'],
+        )
+        counts = {parent.id: count for parent, count in groups}
+        for log in self:
+            log.individual_log_count = counts.get(log.id, 0)
+
+    @api.depends('product_id')
+    def _compute_unit_cost(self):
+        """Toma el costo del producto; no sigue los cambios de precio posteriores"""
+        for log in self:
+            log.unit_cost = log.product_id.standard_price
+
+    @api.depends('unit_cost', 'dose')
     def _compute_cost_per_animal(self):
         """Calcula el costo por animal"""
         for log in self:
             if log.product_id and log.dose:
                 # Cálculo básico basado en el precio del producto
-                log.cost_per_animal = log.product_id.standard_price * (log.dose / 100.0)
+                log.cost_per_animal = log.unit_cost * (log.dose / 100.0)
             else:
                 log.cost_per_animal = 0.0
 
@@ -163,43 +283,243 @@ class LivestockHealthLog(models.Model):
         for log in self:
             log.total_cost = log.cost_per_animal * log.animal_count
 
-    @api.model
-    def create(self, vals):
+    @api.depends('animal_id', 'lot_id')
+    def _compute_cost_location(self):
+        """Fija el lote, campo y actividad a los que se imputa el costo.
+
+        Un registro por lote se imputa a la actividad de la mayoría de los
+        animales del lote al registrarlo.
+        """
+        lot_logs = self.filtered(lambda log: log.lot_id and not log.animal_id)
+        activity_types = {}
+        if lot_logs:
+            activity_types = self.env['livestock.stock'].get_main_activity_types(lot_logs.lot_id.ids)
+        for log in self:
+            if log.animal_id:
+                log.cost_lot_id = log.animal_id.current_lot_id
+                log.cost_field_id = log.animal_id.current_field_id
+                log.activity_type = log.animal_id.activity_type
+            else:
+                log.cost_lot_id = log.lot_id
+                log.cost_field_id = log.lot_id.field_id
+                log.activity_type = activity_types.get(log.lot_id.id, False)
+
+    @api.model_create_multi
+    def create(self, vals_list):
         """Sobrescribe create para crear registros individuales si es por lote"""
-        log = super(LivestockHealthLog, self).create(vals)
+        logs = super(LivestockHealthLog, self).create(vals_list)
         
-        # Si es un registro por lote, crear registros individuales
-        if log.lot_id and not log.animal_id:
-            log._create_individual_logs()
+        # Si es un registro por lote, crear registros individuales; las
+        # aplicaciones que programa el calendario se abren al aplicarse
+        if not self.env.context.get('livestock_defer_health_fanout'):
+            logs._fanout_lot_logs()
         
-        return log
+        return logs
 
-    def _create_individual_logs(self):
-        """Crea registros individuales para cada animal del lote"""
-        self.ensure_one()
-        if not self.lot_id:
-            return
+    def write(self, vals):
+        """Genera los registros individuales de los lotes planificados al aplicarse"""
+        planned = self.filtered(lambda log: log.state == 'planned') if vals.get('state', 'planned') != 'planned' else self.browse()
+        result = super(LivestockHealthLog, self).write(vals)
+        if planned and 'unit_cost' not in vals:
+            # El costo de una aplicación planificada se fija al aplicarla
+            for product, logs in planned.grouped('product_id').items():
+                if product:
+                    logs.write({'unit_cost': product.standard_price})
+        planned._fanout_lot_logs()
+        return result
+
+    def _fanout_lot_logs(self):
+        """Crea los registros individuales de los registros por lote.
+
+        Se omiten los registros que ya los generaron, de modo que las
+        aplicaciones del calendario se abren por animal una sola vez, al
+        aplicarse.
+        """
+        lot_logs = self.filtered(lambda log: log.lot_id and not log.animal_id and not log.fanout_state)
+        if lot_logs:
+            large_logs = lot_logs.filtered(lambda log: log.animal_count > FANOUT_SYNC_LIMIT)
+            (lot_logs - large_logs)._create_individual_logs()
+            (lot_logs - large_logs).write({'fanout_state': 'done'})
+            if large_logs:
+                # Los lotes muy grandes se completan por tandas en segundo plano
+                large_logs.write({'fanout_state': 'pending'})
+                self.env.ref('livestock_management.ir_cron_livestock_health_fanout')._trigger()
+
+    def _create_individual_logs(self, limit=None):
+        """Crea registros individuales para cada animal de los lotes, en un solo create.
+
+        Los animales se recorren por id y cada registro de lote continúa
+        desde el último animal que ya tiene su registro individual, de modo
+        que puede llamarse varias veces con un límite para avanzar por tandas
+        sin volver a leer lo ya generado. Devuelve la cantidad de registros
+        creados.
+        """
+        lot_logs = self.filtered(lambda log: log.lot_id and not log.animal_id)
+        if not lot_logs:
+            return 0
+        
+        # Último animal generado por cada registro de lote, en una consulta
+        self.flush_model(['parent_log_id', 'animal_id'])
+        self.env.cr.execute("""
+            SELECT parent_log_id, MAX(animal_id)
+              FROM livestock_health_log
+             WHERE parent_log_id IN %s
+             GROUP BY parent_log_id
+        """, [tuple(lot_logs.ids)])
+        cursors = dict(self.env.cr.fetchall())
+        
+        Animal = self.env['livestock.animal']
+        animal_ids_by_log = {}
+        if limit is None:
+            # Todos los animales activos de los lotes en una sola búsqueda
+            animal_ids_by_lot = defaultdict(list)
+            for animal in Animal.search_read([
+                ('current_lot_id', 'in', lot_logs.lot_id.ids),
+                ('status', '=', 'active'),
+                ('id', '>', min(cursors.get(log.id, 0) for log in lot_logs)),
+            ], ['current_lot_id'], order='id'):
+                animal_ids_by_lot[animal['current_lot_id'][0]].append(animal['id'])
+            for log in lot_logs:
+                cursor = cursors.get(log.id, 0)
+                animal_ids_by_log[log] = [
+                    animal_id for animal_id in animal_ids_by_lot[log.lot_id.id] if animal_id > cursor
+                ]
+        else:
+            # Por tandas: solo los animales que siguen al cursor de cada registro
+            remaining = limit
+            for log in lot_logs:
+                if remaining <= 0:
+                    break
+                animal_ids_by_log[log] = Animal.search([
+                    ('current_lot_id', '=', log.lot_id.id),
+                    ('status', '=', 'active'),
+                    ('id', '>', cursors.get(log.id, 0)),
+                ], order='id', limit=remaining).ids
+                remaining -= len(animal_ids_by_log[log])
+        
+        vals_list = []
+        for log, animal_ids in animal_ids_by_log.items():
+            common_vals = {
+                'parent_log_id': log.id,
+                'log_type': log.log_type,
+                'date': log.date,
+                'product_id': log.product_id.id,
+                'dose': log.dose,
+                'dose_unit': log.dose_unit,
+                'unit_cost': log.unit_cost,
+                'veterinarian': log.veterinarian,
+                'notes': f"Aplicado en lote: {log.lot_id.name}. {log.notes or ''}",
+                'state': log.state,
+                'next_application_date': log.next_application_date,
+            }
+            vals_list.extend(dict(common_vals, animal_id=animal_id) for animal_id in animal_ids)
+        
+        self.create(vals_list)
+        return len(vals_list)
+
+    @api.model
+    def _cron_create_individual_logs(self):
+        """Genera por tandas los registros individuales de lotes grandes, informando el avance"""
+        pending_logs = self.search([('fanout_state', '=', 'pending')], order='id')
+        if not pending_logs:
+            return True
+        
+        created = pending_logs._create_individual_logs(limit=FANOUT_CHUNK_SIZE)
+        remaining = sum(pending_logs.mapped('animal_count')) - self.search_count(
+            [('parent_log_id', 'in', pending_logs.ids)]
+        )
+        if remaining <= 0 or not created:
+            pending_logs.write({'fanout_state': 'done'})
+            remaining = 0
+        self.env['ir.cron']._notify_progress(done=created, remaining=remaining)
+        return True
+
+    @api.model
+    def _cron_schedule_due_applications(self, horizon_days=DUE_SCHEDULE_HORIZON_DAYS):
+        """Programa en bloque las próximas aplicaciones que vencen dentro del horizonte.
+
+        Los registros por lote con la misma fecha, lote, tipo y producto se
+        agrupan en una única aplicación planificada del lote; los registros
+        individuales sueltos generan su aplicación planificada por animal.
+        """
+        sources = self.search([
+            ('next_application_date', '!=', False),
+            ('next_application_date', '<=', fields.Date.today() + timedelta(days=horizon_days)),
+            ('next_log_id', '=', False),
+            ('parent_log_id', '=', False),
+            ('state', '!=', 'planned'),
+        ], order='next_application_date, id')
+        if not sources:
+            return True
+        
+        groups = defaultdict(lambda: self.browse())
+        for log in sources:
+            if log.lot_id:
+                key = ('lot', log.lot_id.id, log.next_application_date, log.log_type, log.product_id.id)
+            else:
+                key = ('animal', log.id)
+            groups[key] |= log
+        
+        vals_list = []
+        for logs in groups.values():
+            log = logs[0]
+            vals_list.append({
+                'animal_id': log.animal_id.id,
+                'lot_id': log.lot_id.id,
+                'log_type': log.log_type,
+                'date': log.next_application_date,
+                'product_id': log.product_id.id,
+                'dose': log.dose,
+                'dose_unit': log.dose_unit,
+                'veterinarian': log.veterinarian,
+                'state': 'planned',
+                'notes': f"Refuerzo de aplicación anterior del {log.date}",
+            })
+        new_logs = self.with_context(livestock_defer_health_fanout=True).create(vals_list)
+        
+        # Enlazar los registros de origen con su aplicación programada, una escritura por grupo
+        for logs, new_log in zip(groups.values(), new_logs):
+            logs.write({'next_log_id': new_log.id})
+        return True
+
+    @api.model
+    def get_cost_rollup(self, groupby=('lot', 'month'), date_from=None, date_to=None):
+        """Agrega los costos sanitarios aplicados con una sola consulta agrupada.
+
+        groupby acepta las claves de COST_ROLLUP_GROUPBY. Los registros
+        individuales generados desde un lote no se suman: su costo ya está en
+        el registro del lote.
+        """
+        unknown = set(groupby) - set(COST_ROLLUP_GROUPBY)
+        if unknown:
+            raise models.UserError(f"Agrupación no soportada: {', '.join(sorted(unknown))}")
         
-        # Buscar todos los animales activos en el lote
-        animals = self.env['livestock.animal'].search([
-            ('current_lot_id', '=', self.lot_id.id),
-            ('status', '=', 'active')
-        ])
+        domain = [('parent_log_id', '=', False), ('state', '!=', 'planned')]
+        if date_from:
+            domain.append(('date', '>=', date_from))
+        if date_to:
+            domain.append(('date', '<=', date_to))
         
-        # Crear un registro individual para cada animal
-        for animal in animals:
-            self.env['livestock.health.log'].create({
-                'animal_id': animal.id,
-                'log_type': self.log_type,
-                'date': self.date,
-                'product_id': self.product_id.id if self.product_id else False,
-                'dose': self.dose,
-                'dose_unit': self.dose_unit,
-                'veterinarian': self.veterinarian,
-                'notes': f"Aplicado en lote: {self.lot_id.name}. {self.notes or ''}",
-                'state': self.state,
-                'next_application_date': self.next_application_date,
+        groups = self._read_group(
+            domain, [COST_ROLLUP_GROUPBY[key] for key in groupby],
+            ['total_cost:sum', 'animal_count:sum', '__count'],
+        )
+        result = []
+        for group in groups:
+            values = group[:len(groupby)]
+            total_cost, animal_count, count = group[len(groupby):]
+            row = {
+                key: value.id if isinstance(value, models.BaseModel) else value
+                for key, value in zip(groupby, values)
+            }
+            row.update({
+                'total_cost': total_cost,
+                'animal_count': animal_count,
+                'count': count,
+                'cost_per_animal': total_cost / animal_count if animal_count else 0.0,
             })
+            result.append(row)
+        return result
 
     def action_mark_applied(self):
         """Marca el registro como aplicado"""
@@ -228,6 +548,17 @@ class LivestockHealthLog(models.Model):
             'target': 'current',
         }
 
+    def action_view_individual_logs(self):
+        """Muestra los registros individuales generados desde el lote"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Registros Individuales - Lote {self.lot_id.name}',
+            'res_model': 'livestock.health.log',
+            'view_mode': 'list,form',
+            'domain': [('parent_log_id', '=', self.id)],
+        }
+
     def action_view_lot_animals(self):
         """Muestra los animales del lote"""
         self.ensure_one()
@@ -248,12 +579,13 @@ class LivestockHealthLog(models.Model):
         if not self.next_application_date:
             raise models.UserError("No se ha definido una fecha para la próxima aplicación.")
         
-        new_log = self.copy({
+        new_log = self.next_log_id or self.copy({
             'date': self.next_application_date,
             'state': 'planned',
             'notes': f"Refuerzo de aplicación anterior del {self.date}",
             'next_application_date': False,
         })
+        self.next_log_id = new_log
         
         return {
             'type': 'ir.actions.act_window',
@@ -267,7 +599,7 @@ class LivestockHealthLog(models.Model):
     def name_get(self):
         """Personaliza la visualización del nombre"""
         result = []
-        log_types = dict(self._fields['log_type'].selection)
+        log_types = self._get_selection_labels('log_type')
         
         for log in self:
             if log.animal_id:
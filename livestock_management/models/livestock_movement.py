@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, tools
+
+
+class LivestockMovement(models.Model):
+    _name = 'livestock.movement'
+    _description = 'Movimiento de Animales entre Lotes'
+    _order = 'date desc, id desc'
+
+    name = fields.Char(
+        string='Referencia',
+        required=True,
+        readonly=True,
+        copy=False,
+        default='Nuevo'
+    )
+    
+    date = fields.Date(
+        string='Fecha del Movimiento',
+        required=True,
+        default=fields.Date.today
+    )
+    
+    source_lot_id = fields.Many2one(
+        'farm.lot',
+        string='Lote de Origen',
+        help="Lote desde el que salen los animales (opcional)"
+    )
+    
+    dest_lot_id = fields.Many2one(
+        'farm.lot',
+        string='Lote de Destino',
+        required=True,
+        help="Lote al que ingresan los animales"
+    )
+    
+    dest_field_id = fields.Many2one(
+        related='dest_lot_id.field_id',
+        string='Campo de Destino',
+        store=True,
+        readonly=True
+    )
+    
+    reason = fields.Selection([
+        ('rotation', 'Rotación de Pastoreo'),
+        ('feedlot', 'Ingreso a Feedlot'),
+        ('weaning', 'Destete'),
+        ('sale_prep', 'Preparación para Venta'),
+        ('other', 'Otro'),
+    ], string='Motivo', default='rotation')
+    
+    animal_ids = fields.Many2many(
+        'livestock.animal',
+        'livestock_movement_animal_rel',
+        'movement_id',
+        'animal_id',
+        string='Animales',
+        domain="[('status', '=', 'active')]"
+    )
+    
+    animal_count = fields.Integer(
+        string='Cantidad de Animales',
+        compute='_compute_animal_count'
+    )
+    
+    line_ids = fields.One2many(
+        'livestock.movement.line',
+        'movement_id',
+        string='Registro de Movimientos',
+        readonly=True
+    )
+    
+    state = fields.Selection([
+        ('draft', 'Borrador'),
+        ('done', 'Realizado'),
+    ], string='Estado', default='draft', required=True, copy=False)
+    
+    notes = fields.Text(
+        string='Observaciones'
+    )
+
+    @api.depends('animal_ids')
+    def _compute_animal_count(self):
+        """Calcula la cantidad de animales a mover"""
+        for movement in self:
+            movement.animal_count = len(movement.animal_ids)
+
+    @api.constrains('source_lot_id', 'dest_lot_id')
+    def _check_lots(self):
+        """Valida que el lote de origen y destino sean distintos"""
+        for movement in self:
+            if movement.source_lot_id and movement.source_lot_id == movement.dest_lot_id:
+                raise models.ValidationError(
+                    "El lote de destino debe ser distinto del lote de origen."
+                )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Asigna la referencia del movimiento"""
+        for vals in vals_list:
+            if vals.get('name', 'Nuevo') == 'Nuevo':
+                vals['name'] = self.env['ir.sequence'].next_by_code('livestock.movement') or 'Nuevo'
+        return super(LivestockMovement, self).create(vals_list)
+
+    def unlink(self):
+        """Solo se pueden eliminar movimientos en borrador"""
+        if any(movement.state == 'done' for movement in self):
+            raise models.UserError("No se puede eliminar un movimiento ya realizado.")
+        return super(LivestockMovement, self).unlink()
+
+    def action_load_source_lot(self):
+        """Carga todos los animales activos del lote de origen"""
+        self.ensure_one()
+        if not self.source_lot_id:
+            raise models.UserError("Debe indicar el lote de origen.")
+        animals = self.env['livestock.animal'].search([
+            ('current_lot_id', '=', self.source_lot_id.id),
+            ('status', '=', 'active'),
+        ])
+        self.animal_ids = [(6, 0, animals.ids)]
+        return True
+
+    def action_confirm(self):
+        """Traslada todos los animales con una única escritura y registra el movimiento"""
+        for movement in self:
+            if movement.state != 'draft':
+                continue
+            animals = movement.animal_ids
+            if not animals:
+                raise models.UserError("Debe seleccionar al menos un animal para mover.")
+            
+            inactive = animals.filtered(lambda a: a.status != 'active')
+            if inactive:
+                raise models.UserError(
+                    "Solo se pueden mover animales activos: "
+                    + ", ".join(inactive.mapped('ear_tag_id'))
+                )
+            if movement.source_lot_id:
+                elsewhere = animals.filtered(lambda a: a.current_lot_id != movement.source_lot_id)
+                if elsewhere:
+                    raise models.UserError(
+                        f"Los siguientes animales no están en el lote {movement.source_lot_id.name}: "
+                        + ", ".join(elsewhere.mapped('ear_tag_id'))
+                    )
+            
+            # Registro en el libro de movimientos, en un solo create;
+            # los animales sin ubicación previa ingresan, no se trasladan
+            self.env['livestock.movement.line'].create([{
+                'movement_id': movement.id,
+                'animal_id': animal.id,
+                'date': movement.date,
+                'move_type': 'transfer' if animal.current_lot_id or animal.current_field_id else 'entry',
+                'from_lot_id': animal.current_lot_id.id,
+                'from_field_id': animal.current_field_id.id,
+                'to_lot_id': movement.dest_lot_id.id,
+                'to_field_id': movement.dest_field_id.id,
+            } for animal in animals])
+            
+            animals.with_context(livestock_skip_movement_ledger=True).write({
+                'current_lot_id': movement.dest_lot_id.id,
+                'current_field_id': movement.dest_field_id.id,
+            })
+            movement.state = 'done'
+        return True
+
+    def action_view_lines(self):
+        """Muestra el registro de movimientos generado"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Movimientos - {self.name}',
+            'res_model': 'livestock.movement.line',
+            'view_mode': 'list',
+            'domain': [('movement_id', '=', self.id)],
+        }
+
+
+class LivestockMovementLine(models.Model):
+    _name = 'livestock.movement.line'
+    _description = 'Libro de Movimientos de Animales'
+    _order = 'date desc, id desc'
+
+    movement_id = fields.Many2one(
+        'livestock.movement',
+        string='Movimiento',
+        ondelete='restrict',
+        index=True,
+        readonly=True
+    )
+    
+    animal_id = fields.Many2one(
+        'livestock.animal',
+        string='Animal',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    
+    animal_ear_tag = fields.Char(
+        related='animal_id.ear_tag_id',
+        string='Caravana',
+        readonly=True
+    )
+    
+    date = fields.Date(
+        string='Fecha',
+        required=True,
+        readonly=True
+    )
+    
+    move_type = fields.Selection([
+        ('entry', 'Ingreso'),
+        ('transfer', 'Traslado'),
+        ('exit', 'Egreso'),
+    ], string='Tipo', required=True, readonly=True)
+    
+    from_lot_id = fields.Many2one('farm.lot', string='Lote de Origen', readonly=True)
+    from_field_id = fields.Many2one('farm.field', string='Campo de Origen', readonly=True)
+    to_lot_id = fields.Many2one('farm.lot', string='Lote de Destino', readonly=True)
+    to_field_id = fields.Many2one('farm.field', string='Campo de Destino', readonly=True)
+
+    def init(self):
+        """Índices para consultar quién estaba en un lote en una fecha"""
+        tools.create_index(
+            self.env.cr, 'livestock_movement_line_lot_date_index', self._table, ['to_lot_id', 'date']
+        )
+        tools.create_index(
+            self.env.cr, 'livestock_movement_line_animal_date_index', self._table, ['animal_id', 'date', 'id']
+        )
+
+    def write(self, vals):
+        """El libro de movimientos no se modifica: solo se agregan registros"""
+        raise models.UserError("El registro de movimientos no puede modificarse.")
+
+    def unlink(self):
+        """El libro de movimientos no se modifica: solo se agregan registros"""
+        raise models.UserError("El registro de movimientos no puede eliminarse.")
+
+    @api.model
+    def _seed_opening_entries(self):
+        """Registra un ingreso de apertura para los animales ubicados sin movimientos.
+
+        Los animales cargados antes del libro de movimientos no tienen ningún
+        registro: se les asienta un ingreso a su ubicación actual con la fecha
+        de alta, para que las consultas por fecha los encuentren.
+        """
+        self.env['livestock.animal'].flush_model()
+        self.flush_model()
+        self.env.cr.execute("""
+            INSERT INTO livestock_movement_line (animal_id, date, move_type, to_field_id, to_lot_id,
+                                                 create_uid, create_date, write_uid, write_date)
+            SELECT animal.id, COALESCE(animal.create_date::date, CURRENT_DATE), 'entry',
+                   animal.current_field_id, animal.current_lot_id,
+                   %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC'
+              FROM livestock_animal animal
+             WHERE animal.status = 'active' AND animal.active
+               AND (animal.current_field_id IS NOT NULL OR animal.current_lot_id IS NOT NULL)
+               AND NOT EXISTS (SELECT 1 FROM livestock_movement_line line
+                                WHERE line.animal_id = animal.id)
+        """, [self.env.uid, self.env.uid])
+        self.invalidate_model()
+        return True
+
+    @api.model
+    def get_lot_animal_ids(self, lot_id, on_date):
+        """Devuelve los animales que estaban en el lote en la fecha indicada, en una consulta"""
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT animal_id
+              FROM (SELECT DISTINCT ON (animal_id) animal_id, to_lot_id
+                      FROM livestock_movement_line
+                     WHERE date <= %(date)s
+                       AND animal_id IN (SELECT animal_id
+                                           FROM livestock_movement_line
+                                          WHERE to_lot_id = %(lot)s AND date <= %(date)s)
+                     ORDER BY animal_id, date DESC, id DESC) AS last_move
+             WHERE to_lot_id = %(lot)s
+        """, {'lot': lot_id, 'date': on_date})
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def get_lot_occupancy(self, lot_ids, date_from, date_to):
+        """Ocupación de los lotes en el período según el libro de movimientos.
+
+        Devuelve {lote: {'animal_days', 'average_head', 'stocking_rate'}}, con
+        la carga expresada en cabezas promedio por hectárea.
+        """
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if not lot_ids:
+            return {}
+        self.flush_model()
+        self.env.cr.execute("""
+            WITH stays AS (
+                SELECT to_lot_id AS lot_id, date AS date_in,
+                       LEAD(date) OVER (PARTITION BY animal_id ORDER BY date, id) AS date_out
+                  FROM livestock_movement_line
+                 WHERE animal_id IN (SELECT animal_id
+                                       FROM livestock_movement_line
+                                      WHERE to_lot_id IN %(lots)s AND date <= %(to)s)
+            )
+            SELECT lot_id,
+                   SUM(GREATEST(0, LEAST(COALESCE(date_out, %(to)s + 1), %(to)s + 1)
+                                   - GREATEST(date_in, %(from)s))) AS animal_days
+              FROM stays
+             WHERE lot_id IN %(lots)s
+             GROUP BY lot_id
+        """, {'lots': tuple(lot_ids), 'from': date_from, 'to': date_to})
+        animal_days = dict(self.env.cr.fetchall())
+
+        days = (date_to - date_from).days + 1
+        result = {}
+        for lot in self.env['farm.lot'].browse(lot_ids):
+            lot_animal_days = animal_days.get(lot.id, 0)
+            average_head = lot_animal_days / days if days > 0 else 0.0
+            result[lot.id] = {
+                'animal_days': lot_animal_days,
+                'average_head': average_head,
+                'stocking_rate': average_head / lot.area if lot.area else 0.0,
+            }
+        return result
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+import logging
+
+# Columnas que identifican cada fila de existencias; NULL se normaliza para el índice único
+STOCK_KEY_COLUMNS = ('field_id', 'lot_id', 'breed_id', 'activity_type', 'age_category')
+STOCK_KEY_INDEX = """
+    COALESCE(field_id, 0), COALESCE(lot_id, 0), COALESCE(breed_id, 0),
+    COALESCE(activity_type, ''), COALESCE(age_category, '')
+"""
+
+_logger = logging.getLogger(__name__)
+
+
+class LivestockStock(models.Model):
+    _name = 'livestock.stock'
+    _description = 'Existencias de Animales'
+    _order = 'field_id, lot_id, breed_id'
+
+    field_id = fields.Many2one(
+        'farm.field',
+        string='Campo',
+        readonly=True,
+        index=True,
+        ondelete='cascade'
+    )
+    
+    lot_id = fields.Many2one(
+        'farm.lot',
+        string='Lote',
+        readonly=True,
+        index=True,
+        ondelete='cascade'
+    )
+    
+    breed_id = fields.Many2one(
+        'livestock.breed',
+        string='Raza',
+        readonly=True,
+        index=True,
+        ondelete='cascade'
+    )
+    
+    activity_type = fields.Selection(
+        selection=lambda self: self.env['livestock.animal']._fields['activity_type'].selection,
+        string='Tipo de Actividad',
+        readonly=True
+    )
+    
+    age_category = fields.Selection(
+        selection=lambda self: self.env['livestock.animal']._fields['age_category'].selection,
+        string='Categoría de Edad',
+        readonly=True
+    )
+    
+    head_count = fields.Integer(
+        string='Cabezas',
+        readonly=True,
+        help="Cantidad de animales activos"
+    )
+
+    def init(self):
+        """Índice único sobre la combinación de claves para acumular por UPSERT"""
+        self.env.cr.execute(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS livestock_stock_key_uniq
+                ON livestock_stock ({STOCK_KEY_INDEX})
+        """)
+
+    @api.model
+    def _apply_delta(self, delta):
+        """Suma las variaciones {clave: cantidad} a las existencias en una sola sentencia"""
+        delta = {key: count for key, count in delta.items() if count}
+        if not delta:
+            return
+        values = [key + (count,) for key, count in delta.items()]
+        self.env.cr.execute(f"""
+            INSERT INTO livestock_stock ({', '.join(STOCK_KEY_COLUMNS)}, head_count,
+                                         create_uid, create_date, write_uid, write_date)
+            SELECT *, %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC'
+              FROM (VALUES {', '.join(['(%s::int, %s::int, %s::int, %s::varchar, %s::varchar, %s::int)'] * len(values))}) AS d
+                ON CONFLICT ({STOCK_KEY_INDEX})
+                DO UPDATE SET head_count = livestock_stock.head_count + EXCLUDED.head_count,
+                              write_uid = EXCLUDED.write_uid,
+                              write_date = EXCLUDED.write_date
+            RETURNING id, head_count
+        """, [self.env.uid, self.env.uid] + [value for row in values for value in row])
+        head_counts = dict(self.env.cr.fetchall())
+        # Solo se revisan las filas tocadas: las vacías se eliminan y las
+        # negativas indican que las existencias se desfasaron de los animales
+        empty_ids = [stock_id for stock_id, head_count in head_counts.items() if head_count == 0]
+        if empty_ids:
+            self.env.cr.execute("DELETE FROM livestock_stock WHERE id IN %s", [tuple(empty_ids)])
+        negative_ids = [stock_id for stock_id, head_count in head_counts.items() if head_count < 0]
+        if negative_ids:
+            _logger.warning(
+                "Existencias negativas en livestock.stock %s: reconstruirlas con _rebuild()", negative_ids,
+            )
+        self._invalidate_head_counts()
+
+    @api.model
+    def _rebuild(self):
+        """Reconstruye todas las existencias desde los animales activos"""
+        self.env['livestock.animal'].flush_model()
+        self.env.cr.execute("DELETE FROM livestock_stock")
+        self.env.cr.execute(f"""
+            INSERT INTO livestock_stock ({', '.join(STOCK_KEY_COLUMNS)}, head_count,
+                                         create_uid, create_date, write_uid, write_date)
+            SELECT current_field_id, current_lot_id, breed_id, activity_type, age_category, COUNT(*),
+                   %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC'
+              FROM livestock_animal
+             WHERE status = 'active' AND active
+             GROUP BY current_field_id, current_lot_id, breed_id, activity_type, age_category
+        """, [self.env.uid, self.env.uid])
+        self._invalidate_head_counts()
+        return True
+
+    @api.model
+    def _unlink_with_animals(self, animal_domain, unlink):
+        """Elimina campos, lotes o razas manteniendo las existencias de sus animales.
+
+        Al borrar el registro, la base deja sus animales sin campo, lote o raza
+        sin pasar por el ORM: se descuentan de sus filas actuales antes de
+        borrar y se vuelven a sumar con la ubicación resultante.
+        """
+        animals = self.env['livestock.animal'].search(animal_domain)
+        self._apply_delta({key: -count for key, count in animals._get_stock_keys().items()})
+        result = unlink()
+        self._apply_delta(animals.exists()._get_stock_keys())
+        return result
+
+    @api.model
+    def _invalidate_head_counts(self):
+        """Descarta de la caché los conteos leídos antes de actualizar las existencias"""
+        self.invalidate_model()
+        self.env['farm.lot'].invalidate_model(['livestock_head_count', 'livestock_stocking_rate'])
+        self.env['farm.field'].invalidate_model(['livestock_head_count'])
+        self.env['livestock.breed'].invalidate_model(['animal_count'])
+
+    @api.model
+    def get_head_counts(self, model_field, ids):
+        """Devuelve {id: cabezas} para los campos, lotes o razas indicados en una consulta"""
+        groups = self._read_group([(model_field, 'in', list(ids))], [model_field], ['head_count:sum'])
+        return {record.id: head_count for record, head_count in groups}
+
+    @api.model
+    def get_main_activity_types(self, lot_ids):
+        """Devuelve {lote: actividad} con la actividad de la mayoría de sus animales, en una consulta"""
+        groups = self._read_group(
+            [('lot_id', 'in', list(lot_ids)), ('activity_type', '!=', False)],
+            ['lot_id', 'activity_type'], ['head_count:sum'],
+        )
+        head_counts = {}
+        result = {}
+        for lot, activity_type, head_count in groups:
+            if head_count > head_counts.get(lot.id, 0):
+                head_counts[lot.id] = head_count
+                result[lot.id] = activity_type
+        return result
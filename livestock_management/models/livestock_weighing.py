@@ -1,26 +1,92 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+from odoo.tools import SQL
+from datetime import date, datetime
+import csv
+import io
+
+import numpy as np
+
+# Parámetro del sistema que permite varios pesajes del mismo animal en el día
+MULTIPLE_PER_DAY_PARAM = 'livestock_management.weighing_multiple_per_day'
+
+# A partir de esta cantidad de registros el GDM se calcula con una sola consulta SQL
+GDM_BATCH_THRESHOLD = 5
+
+# Pesaje anterior de cada registro según (animal, fecha, id) mediante LAG()
+GDM_WINDOW_QUERY = """
+    SELECT id,
+           date - LAG(date) OVER w AS days_since_last,
+           weight_kg - LAG(weight_kg) OVER w AS weight_gain
+      FROM livestock_weighing
+     WHERE animal_id IN %s
+    WINDOW w AS (PARTITION BY animal_id ORDER BY date, sequence, id)
+"""
+
+# Días previos al último pesaje usados para estimar la GDM reciente de la curva de peso
+WEIGHT_CURVE_GDM_WINDOW = 90
+
+# Encabezados reconocidos en los archivos de sesión de balanza
+SCALE_TAG_HEADERS = {'eid', 'rfid', 'tag', 'ear_tag', 'ear_tag_id', 'caravana'}
+SCALE_WEIGHT_HEADERS = {'weight', 'weight_kg', 'peso', 'peso_kg', 'kg'}
+SCALE_DATE_HEADERS = {'date', 'datetime', 'timestamp', 'time', 'fecha', 'fecha_hora'}
+SCALE_DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%d-%m-%Y',
+)
+
+# Agrupaciones de get_gdm_statistics: columnas devueltas y tablas necesarias
+GDM_STATS_GROUPBY = {
+    'breed': (["w.animal_breed AS breed"], []),
+    'activity_type': (["a.activity_type AS activity_type"], ['animal']),
+    'field': (["a.current_field_id AS field_id", "ff.name AS field_name"], ['animal', 'field']),
+    'lot': (["a.current_lot_id AS lot_id", "fl.name AS lot_name"], ['animal', 'lot']),
+    'month': (["date_trunc('month', w.date)::date AS month"], []),
+}
+GDM_STATS_JOINS = {
+    'animal': "JOIN livestock_animal a ON a.id = w.animal_id",
+    'field': "LEFT JOIN farm_field ff ON ff.id = a.current_field_id",
+    'lot': "LEFT JOIN farm_lot fl ON fl.id = a.current_lot_id",
+}
 
 
 class LivestockWeighing(models.Model):
     _name = 'livestock.weighing'
+    _inherit = ['farm.import.mixin']
     _description = 'Control de Pesaje del Ganado'
-    _order = 'date desc, id desc'
+    _order = 'date desc, sequence desc, id desc'
+    _sql_constraints = [
+        ('animal_date_sequence_uniq',
+         'UNIQUE (animal_id, date, sequence)',
+         'Ya existe un pesaje para el animal en esa fecha.'),
+    ]
 
     animal_id = fields.Many2one(
         'livestock.animal',
         string='Animal',
         required=True,
+        index=True,
         help="Animal pesado"
     )
     
     date = fields.Date(
         string='Fecha del Pesaje',
         required=True,
+        index=True,
         default=fields.Date.today
     )
     
+    sequence = fields.Integer(
+        string='Pesada del Día',
+        default=1,
+        required=True,
+        readonly=True,
+        copy=False,
+        help="Número de pesada del animal en la fecha. Solo supera 1 si la política "
+             "de pesajes permite varios pesajes por día."
+    )
+    
     weight_kg = fields.Float(
         string='Peso (kg)',
         required=True,
@@ -108,6 +174,13 @@ class LivestockWeighing(models.Model):
         help="Persona que verificó el pesaje"
     )
 
+    def init(self):
+        """Índice parcial para las estadísticas de GDM por período"""
+        tools.create_index(
+            self.env.cr, 'livestock_weighing_gdm_stats_index', self._table,
+            ['date', 'animal_breed', 'gdm'], where='gdm > 0'
+        )
+
     @api.constrains('weight_kg')
     def _check_weight(self):
         """Valida que el peso sea positivo y razonable"""
@@ -120,21 +193,6 @@ class LivestockWeighing(models.Model):
                     "El peso parece excesivo. Verifique el valor ingresado."
                 )
 
-    @api.constrains('date', 'animal_id')
-    def _check_date_uniqueness(self):
-        """Evita múltiples pesajes en la misma fecha para el mismo animal"""
-        for weighing in self:
-            duplicate = self.search([
-                ('animal_id', '=', weighing.animal_id.id),
-                ('date', '=', weighing.date),
-                ('id', '!=', weighing.id)
-            ])
-            if duplicate:
-                raise models.ValidationError(
-                    f"Ya existe un pesaje para el animal {weighing.animal_id.ear_tag_id} "
-                    f"en la fecha {weighing.date}."
-                )
-
     @api.constrains('date')
     def _check_date(self):
         """Valida que la fecha no sea futura"""
@@ -147,19 +205,28 @@ class LivestockWeighing(models.Model):
     @api.depends('animal_id', 'date', 'weight_kg')
     def _compute_gdm(self):
         """Calcula la ganancia diaria media (GDM)"""
-        for weighing in self:
+        batch = self.filtered('id')
+        if len(batch) > GDM_BATCH_THRESHOLD:
+            values = batch._read_gdm_values()
+            for weighing in batch:
+                weighing.update(values.get(weighing.id) or self._gdm_values(None, None))
+        else:
+            batch = self.browse()
+
+        for weighing in self - batch:
             if not weighing.animal_id or not weighing.date:
                 weighing.gdm = 0.0
                 weighing.days_since_last = 0
                 weighing.weight_gain = 0.0
                 continue
             
-            # Buscar el pesaje anterior
+            # Buscar el pesaje anterior con el mismo orden (fecha, pesada, id) que LAG()
             previous_weighing = self.search([
                 ('animal_id', '=', weighing.animal_id.id),
-                ('date', '<', weighing.date),
-                ('id', '!=', weighing.id)
-            ], order='date desc', limit=1)
+                ('id', '!=', weighing.id),
+                '|', ('date', '<', weighing.date),
+                '&', ('date', '=', weighing.date), ('sequence', '<', weighing.sequence),
+            ], order='date desc, sequence desc, id desc', limit=1)
             
             if previous_weighing:
                 # Calcular días transcurridos
@@ -181,38 +248,188 @@ class LivestockWeighing(models.Model):
                 weighing.weight_gain = 0.0
 
     @api.model
-    def create(self, vals):
+    def _gdm_values(self, days_since_last, weight_gain):
+        """Arma los valores de GDM a partir de la diferencia con el pesaje anterior"""
+        if days_since_last is None:
+            # Es el primer pesaje
+            return {'gdm': 0.0, 'days_since_last': 0, 'weight_gain': 0.0}
+        return {
+            'gdm': weight_gain / days_since_last if days_since_last > 0 else 0.0,
+            'days_since_last': days_since_last,
+            'weight_gain': weight_gain,
+        }
+
+    def _read_gdm_values(self):
+        """Calcula GDM, días y ganancia de todo el recordset en una sola consulta.
+
+        El pesaje anterior se obtiene con LAG() sobre (animal, fecha, pesada, id),
+        el mismo orden que usa el cálculo registro por registro.
+        """
+        if not self:
+            return {}
+        self.flush_model(['animal_id', 'date', 'sequence', 'weight_kg'])
+        animal_ids = tuple(self.mapped('animal_id').ids)
+        if not animal_ids:
+            return {}
+        self.env.cr.execute(
+            f"SELECT * FROM ({GDM_WINDOW_QUERY}) AS prev WHERE id IN %s",
+            [animal_ids, tuple(self.ids)]
+        )
+        return {
+            weighing_id: self._gdm_values(days, gain)
+            for weighing_id, days, gain in self.env.cr.fetchall()
+        }
+
+    def recompute_gdm(self):
+        """Recalcula y guarda en bloque el GDM del recordset con un único UPDATE"""
+        weighings = self.filtered('id')
+        if not weighings:
+            return True
+        # Los valores se escriben por SQL: descartar cálculos pendientes y
+        # volcar a la base cualquier cambio en memoria antes del UPDATE
+        gdm_fields = [self._fields[fname] for fname in ('gdm', 'days_since_last', 'weight_gain')]
+        for field in gdm_fields:
+            self.env.remove_to_compute(field, weighings)
+        self.flush_model()
+        self.env.cr.execute(f"""
+            UPDATE livestock_weighing AS lw
+               SET days_since_last = COALESCE(prev.days_since_last, 0),
+                   weight_gain = COALESCE(prev.weight_gain, 0.0),
+                   gdm = CASE WHEN prev.days_since_last > 0
+                              THEN prev.weight_gain / prev.days_since_last
+                              ELSE 0.0 END
+              FROM ({GDM_WINDOW_QUERY}) AS prev
+             WHERE lw.id = prev.id
+               AND lw.id IN %s
+        """, [tuple(weighings.mapped('animal_id').ids), tuple(weighings.ids)])
+
+        self.invalidate_model([field.name for field in gdm_fields])
+        return True
+
+    @api.model
+    def recompute_gdm_for_animals(self, animal_ids):
+        """Recalcula el GDM de todos los pesajes de los animales indicados"""
+        return self.search([('animal_id', 'in', list(animal_ids))]).recompute_gdm()
+
+    @api.model
+    def _allow_multiple_per_day(self):
+        """Indica si la política permite varios pesajes del mismo animal en el día"""
+        return bool(self.env['ir.config_parameter'].sudo().get_param(MULTIPLE_PER_DAY_PARAM))
+
+    @api.model
+    def _assign_daily_sequences(self, vals_list):
+        """Numera en bloque las pesadas de cada animal y fecha a continuación de las existentes"""
+        keys = [
+            (vals['animal_id'], fields.Date.to_date(vals.get('date') or fields.Date.context_today(self)))
+            for vals in vals_list
+        ]
+        if not keys:
+            return vals_list
+        self.flush_model(['animal_id', 'date', 'sequence'])
+        animal_ids, dates = zip(*keys)
+        self.env.cr.execute("""
+            SELECT w.animal_id, w.date, MAX(w.sequence)
+              FROM livestock_weighing w
+              JOIN (SELECT DISTINCT * FROM unnest(%s::int[], %s::date[])) AS k(animal_id, date)
+                ON k.animal_id = w.animal_id AND k.date = w.date
+             GROUP BY w.animal_id, w.date
+        """, [list(animal_ids), list(dates)])
+        last_sequence = {(animal_id, day): sequence for animal_id, day, sequence in self.env.cr.fetchall()}
+        for vals, key in zip(vals_list, keys):
+            last_sequence[key] = last_sequence.get(key, 0) + 1
+            vals['sequence'] = last_sequence[key]
+        return vals_list
+
+    @api.model
+    def get_weighing_conflicts(self, vals_list):
+        """Informa de una vez todos los pesajes que chocarían con la política del día.
+
+        Devuelve una lista de (índice en vals_list, mensaje). Con la política de
+        varios pesajes por día no hay conflictos posibles.
+        """
+        if self._allow_multiple_per_day():
+            return []
+        keys = [
+            (vals.get('animal_id'), fields.Date.to_date(vals.get('date') or fields.Date.context_today(self)))
+            for vals in vals_list
+        ]
+        existing = self._get_existing_weighing_keys([key for key in keys if key[0]])
+        animals = self.env['livestock.animal'].browse({key[0] for key in keys if key[0]})
+        tags = dict(zip(animals.ids, animals.mapped('ear_tag_id')))
+        conflicts = []
+        seen = set()
+        for index, key in enumerate(keys):
+            if key in existing:
+                conflicts.append((index, f"ya existe un pesaje para '{tags.get(key[0])}' en la fecha {key[1]}."))
+            elif key in seen:
+                conflicts.append((index, f"pesaje duplicado para '{tags.get(key[0])}' en la fecha {key[1]}."))
+            seen.add(key)
+        return conflicts
+
+    @api.model_create_multi
+    def create(self, vals_list):
         """Sobrescribe create para validaciones adicionales"""
-        weighing = super(LivestockWeighing, self).create(vals)
+        # La unicidad por animal y fecha la garantiza el índice único; solo
+        # con varios pesajes por día hace falta numerar las pesadas
+        if self._allow_multiple_per_day():
+            self._assign_daily_sequences([vals for vals in vals_list if vals.get('animal_id') and 'sequence' not in vals])
+        weighings = super(LivestockWeighing, self).create(vals_list)
         
-        # Recalcular GDM para pesajes posteriores del mismo animal
-        weighing._recalculate_subsequent_gdm()
+        # Recalcular GDM del pesaje siguiente de cada animal
+        weighings._get_next_weighings().recompute_gdm()
         
-        return weighing
+        return weighings
 
     def write(self, vals):
         """Sobrescribe write para recalcular GDM si cambian valores críticos"""
-        result = super(LivestockWeighing, self).write(vals)
+        moved = 'date' in vals or 'animal_id' in vals
         
-        if 'weight_kg' in vals or 'date' in vals:
+        # Si el pesaje cambia de lugar, su siguiente actual pasa a tener otro anterior
+        previous_next = self._get_next_weighings() if moved else self.browse()
+        
+        if moved and 'sequence' not in vals and self._allow_multiple_per_day():
+            # Cada pesaje movido pasa a ser la última pesada de su nuevo día
+            result = True
             for weighing in self:
-                weighing._recalculate_subsequent_gdm()
+                weighing_vals = dict(vals)
+                weighing_vals['sequence'] = self._assign_daily_sequences([{
+                    'animal_id': vals.get('animal_id', weighing.animal_id.id),
+                    'date': vals.get('date', weighing.date),
+                }])[0]['sequence']
+                result &= super(LivestockWeighing, weighing).write(weighing_vals)
+        else:
+            result = super(LivestockWeighing, self).write(vals)
+        
+        if moved or 'weight_kg' in vals:
+            (previous_next | self._get_next_weighings()).recompute_gdm()
         
         return result
 
-    def _recalculate_subsequent_gdm(self):
-        """Recalcula el GDM para pesajes posteriores del mismo animal"""
-        self.ensure_one()
-        
-        # Buscar pesajes posteriores del mismo animal
-        subsequent_weighings = self.search([
-            ('animal_id', '=', self.animal_id.id),
-            ('date', '>', self.date)
-        ], order='date asc')
-        
-        # Forzar recálculo del GDM
-        for weighing in subsequent_weighings:
-            weighing._compute_gdm()
+    def unlink(self):
+        """Sobrescribe unlink para recalcular GDM del pesaje siguiente"""
+        next_weighings = self._get_next_weighings()
+        result = super(LivestockWeighing, self).unlink()
+        next_weighings.exists().recompute_gdm()
+        return result
+
+    def _get_next_weighings(self):
+        """Devuelve el pesaje inmediato siguiente de cada registro (fuera del recordset).
+
+        Solo ese pesaje cambia de GDM al insertar, mover o editar uno anterior,
+        por lo que no hace falta recalcular el resto del historial.
+        """
+        weighings = self.filtered('id')
+        if not weighings:
+            return self.browse()
+        self.flush_model(['animal_id', 'date', 'sequence'])
+        self.env.cr.execute("""
+            SELECT next_id
+              FROM (SELECT id, LEAD(id) OVER (PARTITION BY animal_id ORDER BY date, sequence, id) AS next_id
+                      FROM livestock_weighing
+                     WHERE animal_id IN %s) AS seq
+             WHERE id IN %s AND next_id IS NOT NULL
+        """, [tuple(weighings.mapped('animal_id').ids), tuple(weighings.ids)])
+        return self.browse({row[0] for row in self.env.cr.fetchall()}) - self
 
     def action_verify_weighing(self):
         """Marca el pesaje como verificado"""
@@ -249,35 +466,355 @@ class LivestockWeighing(models.Model):
             }
         }
 
+    @api.model
+    def import_scale_session(self, content, default_date=None, weighing_reason='routine',
+                             delimiter=None, skip_errors=False):
+        """Importa en bloque una sesión de balanza (CSV/TSV con caravana, peso y fecha).
+
+        Las caravanas se resuelven con una sola búsqueda, los pesajes ya
+        existentes se detectan con una sola consulta y los registros se crean
+        con un único create múltiple. Devuelve (pesajes creados, errores).
+        """
+        rows, errors = self._parse_scale_session(content, default_date, delimiter)
+
+        # Resolver todas las caravanas de la sesión en una sola búsqueda; las
+        # caravanas son únicas dentro de cada compañía
+        tags = {row['tag'] for row in rows}
+        animal_by_tag = {
+            animal['ear_tag_id']: animal
+            for animal in self.env['livestock.animal'].search_read(
+                [('ear_tag_id', 'in', list(tags)), ('company_id', '=', self.env.company.id)],
+                ['ear_tag_id', 'status'],
+            )
+        }
+
+        valid_rows = []
+        for row in rows:
+            animal = animal_by_tag.get(row['tag'])
+            if not animal:
+                errors.append(f"Línea {row['line']}: no existe un animal con caravana '{row['tag']}'.")
+                continue
+            if animal['status'] != 'active':
+                errors.append(f"Línea {row['line']}: el animal con caravana '{row['tag']}' ya no está activo.")
+                continue
+            row['animal_id'] = animal['id']
+            valid_rows.append(row)
+
+        vals_list = [{
+            'animal_id': row['animal_id'],
+            'date': row['date'],
+            'weight_kg': row['weight_kg'],
+            'weighing_reason': weighing_reason,
+        } for row in valid_rows]
+
+        # Validar duplicados del archivo y pesajes existentes en una sola consulta
+        conflicts = dict(self.get_weighing_conflicts(vals_list))
+        for index, message in conflicts.items():
+            errors.append(f"Línea {valid_rows[index]['line']}: {message}")
+        vals_list = [vals for index, vals in enumerate(vals_list) if index not in conflicts]
+
+        if errors and not skip_errors:
+            raise models.UserError(
+                "No se importó la sesión de balanza:\n" + self._format_import_errors(errors)
+            )
+
+        return self.create(vals_list), errors
+
+    @api.model
+    def _get_existing_weighing_keys(self, keys):
+        """Devuelve los pares (animal, fecha) que ya tienen pesaje, en una consulta"""
+        if not keys:
+            return set()
+        self.flush_model(['animal_id', 'date'])
+        animal_ids, dates = zip(*keys)
+        self.env.cr.execute("""
+            SELECT w.animal_id, w.date
+              FROM livestock_weighing w
+              JOIN unnest(%s::int[], %s::date[]) AS k(animal_id, date)
+                ON k.animal_id = w.animal_id AND k.date = w.date
+        """, [list(animal_ids), list(dates)])
+        return set(self.env.cr.fetchall())
+
+    @api.model
+    def _parse_scale_session(self, content, default_date=None, delimiter=None):
+        """Lee las filas de la sesión de balanza y devuelve (filas, errores)"""
+        if isinstance(content, bytes):
+            try:
+                content = content.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                content = content.decode('latin-1')
+
+        if not delimiter:
+            try:
+                delimiter = csv.Sniffer().sniff(content[:4096], delimiters=',;\t|').delimiter
+            except csv.Error:
+                delimiter = ','
+
+        reader = csv.reader(io.StringIO(content), delimiter=delimiter)
+        columns = {'tag': 0, 'weight': 1, 'date': 2}
+        rows, errors = [], []
+        for line, values in enumerate(reader, start=1):
+            values = [value.strip() for value in values]
+            if not any(values):
+                continue
+            if line == 1:
+                header = self._parse_scale_header(values)
+                if header:
+                    columns = header
+                    continue
+
+            tag = values[columns['tag']] if len(values) > columns['tag'] else ''
+            if not tag:
+                errors.append(f"Línea {line}: falta la caravana.")
+                continue
+
+            try:
+                weight_kg = float(values[columns['weight']].replace(',', '.'))
+            except (IndexError, ValueError):
+                errors.append(f"Línea {line}: peso inválido para '{tag}'.")
+                continue
+
+            raw_date = values[columns['date']] if columns.get('date') is not None and len(values) > columns['date'] else ''
+            weighing_date = self._parse_scale_date(raw_date) if raw_date else fields.Date.to_date(default_date)
+            if not weighing_date:
+                errors.append(f"Línea {line}: fecha inválida o faltante para '{tag}'.")
+                continue
+
+            rows.append({'line': line, 'tag': tag, 'weight_kg': weight_kg, 'date': weighing_date})
+        return rows, errors
+
+    @api.model
+    def _parse_scale_header(self, values):
+        """Detecta la fila de encabezados y devuelve la posición de cada columna"""
+        names = [value.lower().replace(' ', '_') for value in values]
+        columns = {}
+        for index, name in enumerate(names):
+            if name in SCALE_TAG_HEADERS:
+                columns.setdefault('tag', index)
+            elif name in SCALE_WEIGHT_HEADERS:
+                columns.setdefault('weight', index)
+            elif name in SCALE_DATE_HEADERS:
+                columns.setdefault('date', index)
+        if 'tag' not in columns or 'weight' not in columns:
+            return False
+        columns.setdefault('date', None)
+        return columns
+
+    @api.model
+    def _parse_scale_date(self, value):
+        """Convierte la marca de tiempo de la balanza en fecha"""
+        for date_format in SCALE_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).date()
+            except ValueError:
+                continue
+        return False
+
+    # Curvas de peso
+    @api.model
+    def _read_weight_curves(self, animal_ids):
+        """Lee en una sola consulta los pesajes de los animales como arreglos NumPy.
+
+        Devuelve (animales, días ordinales, pesos) ordenados por animal y fecha.
+        """
+        self.flush_model(['animal_id', 'date', 'sequence', 'weight_kg'])
+        self.env.cr.execute("""
+            SELECT animal_id, date, weight_kg
+              FROM livestock_weighing
+             WHERE animal_id IN %s AND weight_kg > 0
+             ORDER BY animal_id, date, sequence, id
+        """, [tuple(animal_ids)])
+        rows = self.env.cr.fetchall()
+        animals = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        days = np.fromiter((row[1].toordinal() for row in rows), dtype=np.int64, count=len(rows))
+        weights = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+        return animals, days, weights
+
+    def _weight_curve_trends(self, animals, days, weights, window_days=WEIGHT_CURVE_GDM_WINDOW):
+        """Calcula la tendencia reciente de cada curva de peso.
+
+        La GDM es la pendiente por mínimos cuadrados de los pesajes de los
+        últimos window_days días (al menos los dos últimos pesajes).
+        Devuelve (animales, último día, último peso, GDM) con un elemento por animal.
+        """
+        last_idx = np.append(np.flatnonzero(np.diff(animals)), len(animals) - 1)
+        uniq = animals[last_idx]
+        group = np.repeat(np.arange(len(uniq)), np.diff(np.append(-1, last_idx)))
+        last_day = days[last_idx]
+
+        mask = days >= last_day[group] - window_days
+        prev_idx = last_idx - 1
+        has_prev = prev_idx >= 0
+        has_prev[has_prev] = animals[prev_idx[has_prev]] == uniq[has_prev]
+        mask[prev_idx[has_prev]] = True
+
+        g = group[mask]
+        x = (days[mask] - last_day[g]).astype(np.float64)
+        y = weights[mask]
+        size = len(uniq)
+        n = np.bincount(g, minlength=size).astype(np.float64)
+        sx = np.bincount(g, x, minlength=size)
+        sy = np.bincount(g, y, minlength=size)
+        sxx = np.bincount(g, x * x, minlength=size)
+        sxy = np.bincount(g, x * y, minlength=size)
+        denom = n * sxx - sx * sx
+        gdm = np.divide(n * sxy - sx * sy, denom, out=np.zeros(size), where=denom > 0)
+        return uniq, last_day, weights[last_idx], gdm
+
+    @api.model
+    def get_weights_at(self, animal_ids, dates, extrapolate=False):
+        """Interpola el peso de muchos animales en fechas arbitrarias.
+
+        Usa una sola lectura de pesajes y una búsqueda vectorizada para todas las
+        combinaciones animal/fecha. Antes del primer pesaje no hay peso; después
+        del último sólo se estima si extrapolate es verdadero, con la GDM reciente.
+        Devuelve {animal_id: [peso o None por cada fecha]}.
+        """
+        animal_ids = list(animal_ids)
+        dates = [fields.Date.to_date(value) for value in dates]
+        result = {animal_id: [None] * len(dates) for animal_id in animal_ids}
+        if not animal_ids or not dates:
+            return result
+        animals, days, weights = self._read_weight_curves(animal_ids)
+        if not len(animals):
+            return result
+
+        query_days = np.array([value.toordinal() for value in dates], dtype=np.int64)
+        q_animals = np.repeat(np.array(animal_ids, dtype=np.int64), len(query_days))
+        q_days = np.tile(query_days, len(animal_ids))
+
+        # Clave combinada (animal, día) para ubicar todas las fechas con un único searchsorted
+        span = int(max(days.max(), query_days.max())) + 1
+        pos = np.searchsorted(animals * span + days, q_animals * span + q_days, side='right')
+        prev = np.clip(pos - 1, 0, len(animals) - 1)
+        nxt = np.clip(pos, 0, len(animals) - 1)
+        has_prev = (pos > 0) & (animals[prev] == q_animals)
+        has_next = (pos < len(animals)) & (animals[nxt] == q_animals)
+
+        between = has_prev & has_next
+        gap = np.maximum(days[nxt] - days[prev], 1)
+        ratio = np.where(between, (q_days - days[prev]) / gap, 0.0)
+        values = weights[prev] + ratio * (weights[nxt] - weights[prev])
+        valid = between | (has_prev & (days[prev] == q_days))
+
+        if extrapolate:
+            uniq, last_day, last_weight, gdm = self._weight_curve_trends(animals, days, weights)
+            after = has_prev & ~has_next
+            trend = np.searchsorted(uniq, q_animals[after])
+            values[after] = last_weight[trend] + np.maximum(gdm[trend], 0.0) * (q_days[after] - last_day[trend])
+            valid |= after
+
+        values = values.reshape(len(animal_ids), len(dates))
+        valid = valid.reshape(len(animal_ids), len(dates))
+        for row, animal_id in enumerate(animal_ids):
+            result[animal_id] = [
+                round(float(value), 2) if ok else None
+                for value, ok in zip(values[row], valid[row])
+            ]
+        return result
+
+    @api.model
+    def get_weight_projections(self, target_weights, window_days=WEIGHT_CURVE_GDM_WINDOW):
+        """Proyecta la fecha en que cada animal alcanza su peso objetivo.
+
+        target_weights es {animal_id: peso objetivo en kg}. Devuelve
+        {animal_id: {'gdm', 'last_date', 'last_weight', 'target_date'}} para los
+        animales con pesajes; target_date es False si la GDM reciente no es positiva.
+        """
+        if not target_weights:
+            return {}
+        animals, days, weights = self._read_weight_curves(target_weights)
+        if not len(animals):
+            return {}
+        uniq, last_day, last_weight, gdm = self._weight_curve_trends(animals, days, weights, window_days)
+
+        targets = np.array([target_weights[animal_id] or 0.0 for animal_id in uniq.tolist()])
+        remaining = targets - last_weight
+        reachable = (targets > 0) & ((remaining <= 0) | (gdm > 0))
+        offsets = np.where(
+            remaining > 0,
+            np.ceil(np.divide(remaining, gdm, out=np.zeros(len(uniq)), where=gdm > 0)),
+            0,
+        ).astype(np.int64)
+        target_days = last_day + offsets
+
+        return {
+            animal_id: {
+                'gdm': round(float(animal_gdm), 3),
+                'last_date': date.fromordinal(int(day)),
+                'last_weight': float(weight),
+                'target_date': date.fromordinal(int(target_day)) if ok else False,
+            }
+            for animal_id, day, weight, animal_gdm, target_day, ok in zip(
+                uniq.tolist(), last_day, last_weight, gdm, target_days, reachable
+            )
+        }
+
     @api.model
     def get_average_gdm_by_breed(self, date_from=None, date_to=None):
         """Obtiene la GDM promedio por raza en un período"""
-        domain = [('gdm', '>', 0)]  # Solo considerar pesajes con GDM calculado
-        
+        breed_stats = {}
+        for group in self.get_gdm_statistics(['breed'], date_from=date_from, date_to=date_to):
+            breed_stats[group['breed']] = {
+                'total_gdm': group['total_gdm'],
+                'count': group['count'],
+                'avg_gdm': group['avg_gdm'],
+                'min_gdm': group['min_gdm'],
+                'max_gdm': group['max_gdm'],
+                'stddev_gdm': group['stddev_gdm'],
+                'head_count': group['head_count'],
+            }
+        return breed_stats
+
+    @api.model
+    def get_gdm_statistics(self, groupby=('breed',), date_from=None, date_to=None):
+        """Estadísticas de GDM agregadas en la base de datos.
+
+        groupby combina 'breed', 'activity_type', 'field', 'lot' (ubicación
+        actual del animal) y 'month'. Devuelve una lista de diccionarios con
+        las claves de agrupación y count, head_count, total_gdm, min_gdm,
+        avg_gdm, max_gdm y stddev_gdm.
+        """
+        unknown = set(groupby) - set(GDM_STATS_GROUPBY)
+        if unknown:
+            raise models.UserError(f"Agrupación no soportada: {', '.join(sorted(unknown))}")
+
+        columns, joins = [], []
+        for key in groupby:
+            group_columns, group_joins = GDM_STATS_GROUPBY[key]
+            columns += group_columns
+            joins += [join for join in group_joins if join not in joins]
+
+        # Solo considerar pesajes con GDM calculado, y solo los que el usuario
+        # puede leer según las reglas de registro
+        domain = [('gdm', '>', 0)]
         if date_from:
             domain.append(('date', '>=', date_from))
         if date_to:
             domain.append(('date', '<=', date_to))
-        
-        weighings = self.search(domain)
-        
-        breed_stats = {}
-        for weighing in weighings:
-            breed = weighing.animal_breed
-            if breed not in breed_stats:
-                breed_stats[breed] = {'total_gdm': 0, 'count': 0}
-            
-            breed_stats[breed]['total_gdm'] += weighing.gdm
-            breed_stats[breed]['count'] += 1
-        
-        # Calcular promedios
-        for breed in breed_stats:
-            if breed_stats[breed]['count'] > 0:
-                breed_stats[breed]['avg_gdm'] = breed_stats[breed]['total_gdm'] / breed_stats[breed]['count']
-            else:
-                breed_stats[breed]['avg_gdm'] = 0
-        
-        return breed_stats
+        weighing_ids = self._search(domain).subselect()
+
+        self.flush_model(['animal_id', 'date', 'gdm', 'animal_breed'])
+        if joins:
+            self.env['livestock.animal'].flush_model(['activity_type', 'current_field_id', 'current_lot_id'])
+        group_positions = ', '.join(str(position) for position in range(1, len(columns) + 1))
+        query = SQL(f"""
+            SELECT {''.join(column + ', ' for column in columns)}
+                   COUNT(*) AS count,
+                   COUNT(DISTINCT w.animal_id) AS head_count,
+                   SUM(w.gdm) AS total_gdm,
+                   MIN(w.gdm) AS min_gdm,
+                   AVG(w.gdm) AS avg_gdm,
+                   MAX(w.gdm) AS max_gdm,
+                   COALESCE(STDDEV_SAMP(w.gdm), 0.0) AS stddev_gdm
+              FROM livestock_weighing w
+              {' '.join(GDM_STATS_JOINS[join] for join in joins)}
+             WHERE w.id IN (%s)
+             {f'GROUP BY {group_positions} ORDER BY {group_positions}' if columns else ''}
+        """, weighing_ids)
+        self.env.flush_query(query)
+        self.env.cr.execute(query)
+        return self.env.cr.dictfetchall()
 
     def name_get(self):
         """Personaliza la visualización del nombre"""
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_livestock_benchmark
+from . import test_compute_query_counts
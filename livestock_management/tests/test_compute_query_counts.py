@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, timedelta
+from itertools import count
+from odoo.tests import tagged
+
+from odoo.addons.farm_management_v18.tests.common import ComputeQueryCountCase
+
+# Animales por lote en los rodeos de prueba
+LOT_SIZE = 100
+
+
+@tagged('post_install', '-at_install')
+class TestLivestockComputeQueryCounts(ComputeQueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tag_sequence = count()
+        # Los nombres de lote son únicos por campo y cada tamaño crea sus propios lotes
+        cls.lot_sequence = count(1)
+        cls.farm_field = cls._create_farm_field()
+        cls.breeds = cls.env['livestock.breed'].create([
+            {'name': 'Angus de Prueba', 'code': 'TAA', 'average_weight_male': 480.0, 'average_weight_female': 420.0},
+            {'name': 'Hereford de Prueba', 'code': 'THH', 'average_weight_male': 470.0, 'average_weight_female': 410.0},
+        ])
+        cls.product = cls.env['product.product'].create({
+            'name': 'Vacuna de Prueba', 'type': 'consu', 'standard_price': 250.0,
+        })
+
+    def _create_lots(self, size):
+        return self.env['farm.lot'].create([{
+            'name': f'Lote {next(self.lot_sequence)}',
+            'field_id': self.farm_field.id,
+            'area': 50.0,
+        } for _index in range(size)])
+
+    def _create_animals(self, size, mothers=None):
+        """Crea un rodeo con dos pesajes por animal, repartido en lotes y razas"""
+        lots = self._create_lots(-(-size // LOT_SIZE))
+        today = date.today()
+        animals = self.env['livestock.animal'].create([{
+            'ear_tag_id': f'QC-{next(self.tag_sequence):06d}',
+            'breed_id': self.breeds[index % len(self.breeds)].id,
+            'gender': 'female' if index % 2 else 'male',
+            'birth_date': today - timedelta(days=300 + index % 400),
+            'activity_type': 'fattening',
+            'current_field_id': self.farm_field.id,
+            'current_lot_id': lots[index // LOT_SIZE].id,
+            'mother_id': mothers[index % len(mothers)].id if mothers else False,
+        } for index in range(size)])
+        self.env['livestock.weighing'].create([{
+            'animal_id': animal.id,
+            'date': today - timedelta(days=days),
+            'weight_kg': weight,
+        } for animal in animals for days, weight in ((120, 220.0), (30, 280.0))])
+        return animals
+
+    def test_weighing_gdm(self):
+        def create_weighings(size):
+            return self.env['livestock.weighing'].create([{
+                'animal_id': animal.id, 'weight_kg': 300.0,
+            } for animal in self._create_animals(size)])
+
+        # Hasta GDM_BATCH_THRESHOLD pesajes se busca el anterior de cada uno
+        self.assertComputeQueries(
+            create_weighings, ['gdm', 'days_since_last', 'weight_gain'], max_queries=6,
+        )
+
+    def test_animal_weights(self):
+        self.assertComputeQueries(
+            self._create_animals,
+            ['current_weight', 'last_weighing_date', 'recent_gdm', 'projected_sale_date'],
+            max_queries=6,
+        )
+
+    def test_animal_age(self):
+        self.assertComputeQueries(
+            self._create_animals, ['age', 'age_months', 'age_days', 'age_category'], max_queries=4,
+        )
+
+    def test_animal_history_counts(self):
+        self.assertComputeQueries(
+            self._create_animals,
+            ['total_weighings', 'total_health_logs', 'total_events', 'children_count'],
+            max_queries=6,
+        )
+
+    def test_animal_genealogy(self):
+        def create_calves(size):
+            return self._create_animals(size, mothers=self._create_animals(max(1, size // 10)))
+
+        self.assertComputeQueries(create_calves, ['descendant_count', 'generation_depth'], max_queries=4)
+
+    def test_health_log_costs(self):
+        def create_logs(size):
+            lots = self._create_animals(size).current_lot_id
+            # Aplicaciones programadas por el calendario, que no se abren por animal
+            health_logs = self.env['livestock.health.log'].with_context(livestock_defer_health_fanout=True)
+            return health_logs.create([{
+                'lot_id': lots[index % len(lots)].id,
+                'log_type': 'vaccination',
+                'date': date.today() + timedelta(days=7),
+                'product_id': self.product.id,
+                'dose': 5.0,
+                'state': 'planned',
+            } for index in range(size)])
+
+        self.assertComputeQueries(
+            create_logs,
+            ['animal_count', 'unit_cost', 'cost_per_animal', 'total_cost',
+             'cost_lot_id', 'cost_field_id', 'activity_type', 'individual_log_count'],
+            max_queries=8,
+        )
+
+    def test_breed_animal_count(self):
+        def create_breeds(size):
+            breeds = self.env['livestock.breed'].create([
+                {'name': f'Raza {index}', 'code': f'R{index:04d}'} for index in range(size)
+            ])
+            self.env['livestock.animal'].create([{
+                'ear_tag_id': f'BR-{breed.id:06d}', 'breed_id': breed.id, 'gender': 'female',
+            } for breed in breeds])
+            return breeds
+
+        self.assertComputeQueries(create_breeds, ['animal_count'], max_queries=3)
+
+    def test_lot_stocking_rate(self):
+        def create_lots(size):
+            lots = self._create_lots(size)
+            self.env['livestock.animal'].create([{
+                'ear_tag_id': f'LT-{lot.id:06d}',
+                'breed_id': self.breeds[0].id,
+                'gender': 'male',
+                'current_field_id': self.farm_field.id,
+                'current_lot_id': lot.id,
+            } for lot in lots])
+            return lots
+
+        self.assertComputeQueries(create_lots, ['livestock_head_count', 'livestock_stocking_rate'], max_queries=3)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+from contextlib import contextmanager
+from datetime import date, timedelta
+import logging
+import os
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Tamaños de rodeo a medir; LIVESTOCK_BENCHMARK_SIZES=1000,10000,100000 agrega el de 100k
+BENCHMARK_SIZES = [
+    int(size) for size in os.environ.get('LIVESTOCK_BENCHMARK_SIZES', '1000,10000').split(',') if size.strip()
+]
+# Años de historia sintética y días entre pesajes de cada animal
+HISTORY_YEARS = int(os.environ.get('LIVESTOCK_BENCHMARK_YEARS', '2'))
+WEIGHING_INTERVAL_DAYS = 90
+# Animales por lote del rodeo sintético
+HERD_LOT_SIZE = 1000
+
+# Campos que carga el formulario del animal
+ANIMAL_FORM_FIELDS = [
+    'ear_tag_id', 'name', 'breed_id', 'gender', 'birth_date', 'age', 'age_category',
+    'mother_id', 'activity_type', 'current_field_id', 'current_lot_id', 'current_weight',
+    'last_weighing_date', 'recent_gdm', 'projected_sale_date', 'status',
+    'total_weighings', 'total_health_logs', 'total_events', 'children_count',
+    'descendant_count', 'generation_depth',
+]
+
+
+@tagged('post_install', '-at_install', '-standard', 'livestock_benchmark')
+class TestLivestockBenchmark(TransactionCase):
+    """Mediciones de rendimiento a escala de rodeo.
+
+    No corren con la suite estándar; ejecutar con:
+    odoo-bin -i livestock_management --test-tags livestock_benchmark
+
+    Cada medición se repite para los tamaños de BENCHMARK_SIZES sobre un rodeo
+    sintético que se descarta al terminar, y el resumen de tiempos y consultas
+    se informa en el log al final de la clase.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+        cls.breed = cls.env['livestock.breed'].create({'name': 'Benchmark Angus', 'code': 'BAA'})
+        cls.breeds = cls.breed | cls.env['livestock.breed'].create([
+            {'name': 'Benchmark Hereford', 'code': 'BHH'},
+            {'name': 'Benchmark Brangus', 'code': 'BBB'},
+        ])
+        province = cls.env['res.country.state'].search([('country_id.code', '=', 'AR')], limit=1)
+        if not province:
+            province = cls.env['res.country.state'].create({
+                'name': 'Benchmark', 'code': 'BMK', 'country_id': cls.env.ref('base.ar').id,
+            })
+        cls.farm_field = cls.env['farm.field'].create({
+            'name': 'Campo Benchmark',
+            'province_id': province.id,
+        })
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.results:
+            lines = [f"{'Medición':<45} {'Animales':>9} {'Segundos':>9} {'Consultas':>10}"]
+            lines += [
+                f"{label:<45} {size:>9} {elapsed:>9.2f} {queries:>10}"
+                for label, size, elapsed, queries in cls.results
+            ]
+            _logger.info("Resumen del benchmark de ganadería:\n%s", "\n".join(lines))
+        super().tearDownClass()
+
+    def _measure(self, label, function, size=0):
+        """Ejecuta la función y devuelve (resultado, segundos, consultas)"""
+        self.env.flush_all()
+        queries_before = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        result = function()
+        self.env.flush_all()
+        elapsed = time.perf_counter() - start
+        queries = self.env.cr.sql_log_count - queries_before
+        _logger.info("%s: %.2f s, %d consultas", label, elapsed, queries)
+        self.results.append((label, size, elapsed, queries))
+        return result, elapsed, queries
+
+    @contextmanager
+    def _isolated_herd(self):
+        """Descarta todo lo creado dentro del bloque, para medir cada tamaño desde cero"""
+        self.env.flush_all()
+        self.env.cr.execute('SAVEPOINT livestock_benchmark')
+        try:
+            yield
+        finally:
+            self.env.cr.execute('ROLLBACK TO SAVEPOINT livestock_benchmark')
+            self.env.transaction.clear()
+            self.env.invalidate_all(flush=False)
+
+    def _create_lots(self, size):
+        """Crea los lotes necesarios para repartir el rodeo"""
+        return self.env['farm.lot'].create([{
+            'name': f'Lote Benchmark {index + 1}',
+            'field_id': self.farm_field.id,
+            'area': 100.0,
+        } for index in range(max(1, -(-size // HERD_LOT_SIZE)))])
+
+    def _herd_vals(self, size, lots, prefix='BENCH'):
+        """Valores de alta de un rodeo sintético repartido en lotes y razas"""
+        today = date.today()
+        return [{
+            'ear_tag_id': f'{prefix}-{index:06d}',
+            'breed_id': self.breeds[index % len(self.breeds)].id,
+            'gender': 'female' if index % 2 else 'male',
+            'birth_date': today - timedelta(days=180 + index % (365 * HISTORY_YEARS)),
+            'activity_type': 'fattening' if index % 3 else 'breeding',
+            'current_field_id': self.farm_field.id,
+            'current_lot_id': lots[index // HERD_LOT_SIZE].id,
+        } for index in range(size)]
+
+    def _create_herd(self, size):
+        """Crea un rodeo con años de pesajes, registros sanitarios y eventos"""
+        lots = self._create_lots(size)
+        animals = self.env['livestock.animal'].create(self._herd_vals(size, lots))
+
+        today = date.today()
+        start = today - timedelta(days=365 * HISTORY_YEARS)
+        weighing_vals = []
+        for position, animal_id in enumerate(animals.ids):
+            weight = 150.0 + position % 50
+            day = start + timedelta(days=position % WEIGHING_INTERVAL_DAYS)
+            while day <= today:
+                weighing_vals.append({'animal_id': animal_id, 'date': day, 'weight_kg': weight})
+                weight += 0.6 * WEIGHING_INTERVAL_DAYS
+                day += timedelta(days=WEIGHING_INTERVAL_DAYS)
+        self.env['livestock.weighing'].create(weighing_vals)
+
+        self.env['livestock.health.log'].create([{
+            'lot_id': lot.id,
+            'log_type': 'vaccination',
+            'date': start + timedelta(days=days),
+            'state': 'completed',
+        } for lot in lots for days in range(0, 365 * HISTORY_YEARS, 180)])
+
+        self.env['livestock.event'].create([{
+            'event_type': 'death',
+            'animal_id': animal_id,
+            'date': today - timedelta(days=7),
+        } for animal_id in animals.ids[::100]])
+        return animals, lots
+
+    def test_register_calving_season(self):
+        """Registra 10.000 terneros con su evento de nacimiento"""
+        birth = date.today() - timedelta(days=30)
+        vals_list = [{
+            'ear_tag_id': f'BENCH-{index:06d}',
+            'breed_id': self.breed.id,
+            'gender': 'female' if index % 2 else 'male',
+            'birth_date': birth - timedelta(days=index % 90),
+        } for index in range(10000)]
+
+        animals, _elapsed, queries = self._measure(
+            "Alta de 10.000 animales",
+            lambda: self.env['livestock.animal'].create(vals_list),
+            size=len(vals_list),
+        )
+
+        self.assertEqual(len(animals), 10000)
+        self.assertEqual(
+            self.env['livestock.event'].search_count([
+                ('animal_id', 'in', animals.ids), ('event_type', '=', 'birth')
+            ]),
+            10000,
+        )
+        # Las altas se agrupan: menos de una consulta por animal
+        self.assertLess(queries, len(vals_list))
+
+    def test_animal_import(self):
+        """Importa el rodeo desde un archivo, como el importador de la interfaz"""
+        import_fields = [
+            'ear_tag_id', 'gender', 'birth_date', 'activity_type',
+            'breed_id/.id', 'current_field_id/.id', 'current_lot_id/.id',
+        ]
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size), self._isolated_herd():
+                lots = self._create_lots(size)
+                rows = [[
+                    vals['ear_tag_id'], vals['gender'], str(vals['birth_date']), vals['activity_type'],
+                    str(vals['breed_id']), str(vals['current_field_id']), str(vals['current_lot_id']),
+                ] for vals in self._herd_vals(size, lots, prefix='IMP')]
+
+                result, _elapsed, queries = self._measure(
+                    "Importación de animales",
+                    lambda: self.env['livestock.animal'].load(import_fields, rows),
+                    size=size,
+                )
+                self.assertFalse(result['messages'])
+                self.assertEqual(len(result['ids']), size)
+                self.assertLess(queries, size)
+
+    def test_weighing_session_import(self):
+        """Importa una sesión de balanza con un pesaje por animal"""
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size), self._isolated_herd():
+                animals, _lots = self._create_herd(size)
+                content = "EID;Peso\n" + "\n".join(
+                    f"{tag};{400 + position % 80}"
+                    for position, tag in enumerate(animals.mapped('ear_tag_id'))
+                )
+
+                (weighings, errors), _elapsed, queries = self._measure(
+                    "Importación de sesión de balanza",
+                    lambda: self.env['livestock.weighing'].import_scale_session(
+                        content.encode(), default_date=date.today(), skip_errors=True,
+                    ),
+                    size=size,
+                )
+                # Los pesajes del rodeo sintético pueden coincidir con la fecha de hoy
+                self.assertEqual(len(weighings) + len(errors), size)
+                self.assertLess(queries, size)
+
+    def test_gdm_recompute(self):
+        """Recalcula el GDM de toda la historia de pesajes del rodeo"""
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size), self._isolated_herd():
+                animals, _lots = self._create_herd(size)
+
+                _result, _elapsed, queries = self._measure(
+                    "Recálculo de GDM",
+                    lambda: self.env['livestock.weighing'].recompute_gdm_for_animals(animals.ids),
+                    size=size,
+                )
+                self.assertLess(queries, 20)
+
+    def test_lot_health_fanout(self):
+        """Registra una vacunación de todos los lotes y genera los registros individuales"""
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size), self._isolated_herd():
+                animals, lots = self._create_herd(size)
+
+                logs, _elapsed, queries = self._measure(
+                    "Vacunación por lote",
+                    lambda: self.env['livestock.health.log'].create([{
+                        'lot_id': lot.id,
+                        'log_type': 'deworming',
+                        'date': date.today(),
+                        'state': 'applied',
+                    } for lot in lots]),
+                    size=size,
+                )
+                self.assertEqual(
+                    self.env['livestock.health.log'].search_count([('parent_log_id', 'in', logs.ids)]),
+                    len(animals.filtered(lambda animal: animal.status == 'active')),
+                )
+                self.assertLess(queries, size)
+
+    def test_breed_statistics(self):
+        """Calcula las estadísticas de GDM y existencias por raza"""
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size), self._isolated_herd():
+                self._create_herd(size)
+                self.env.invalidate_all()
+
+                def breed_statistics():
+                    self.breeds.mapped('animal_count')
+                    self.env['livestock.weighing'].get_average_gdm_by_breed()
+                    return self.env['livestock.weighing'].get_gdm_statistics(groupby=('breed', 'month'))
+
+                stats, _elapsed, queries = self._measure("Estadísticas por raza", breed_statistics, size=size)
+                self.assertTrue(stats)
+                self.assertLess(queries, 20)
+
+    def test_animal_form_load(self):
+        """Abre la ficha de un animal con historia larga y de uno con historia corta"""
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size), self._isolated_herd():
+                animals, _lots = self._create_herd(size)
+                old_cow = animals[0]
+                # Un animal recién comprado, con un único pesaje
+                heifer = self.env['livestock.animal'].create(dict(
+                    self._herd_vals(1, _lots, prefix='NEW')[0], gender='female',
+                ))
+                self.env['livestock.weighing'].create({'animal_id': heifer.id, 'weight_kg': 220.0})
+
+                query_counts = []
+                for animal in (old_cow, heifer):
+                    self.env.invalidate_all()
+                    _result, _elapsed, queries = self._measure(
+                        f"Apertura de ficha ({animal.ear_tag_id})",
+                        lambda: animal.read(ANIMAL_FORM_FIELDS),
+                        size=size,
+                    )
+                    query_counts.append(queries)
+                # La cantidad de consultas no depende del largo de la historia
+                self.assertEqual(query_counts[0], query_counts[1])
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import livestock_weighing_import_wizard
+from . import livestock_event_bulk_wizard
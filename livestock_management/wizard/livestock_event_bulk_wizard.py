@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+
+class LivestockEventBulkWizard(models.TransientModel):
+    _name = 'livestock.event.bulk.wizard'
+    _description = 'Asistente de Registro Masivo de Eventos'
+
+    event_type = fields.Selection([
+        ('death', 'Mortandad'),
+        ('sale', 'Venta'),
+    ], string='Tipo de Evento', required=True, default='death')
+    
+    date = fields.Date(
+        string='Fecha del Evento',
+        required=True,
+        default=fields.Date.today
+    )
+    
+    lot_id = fields.Many2one(
+        'farm.lot',
+        string='Lote',
+        help="Permite cargar todos los animales activos del lote"
+    )
+    
+    animal_ids = fields.Many2many(
+        'livestock.animal',
+        string='Animales',
+        domain="[('status', '=', 'active')]"
+    )
+    
+    animal_count = fields.Integer(
+        string='Cantidad de Animales',
+        compute='_compute_animal_count'
+    )
+    
+    cause_of_death = fields.Char(
+        string='Causa de la Muerte',
+        help="Causa común de la mortandad (granizo, inundación, etc.)"
+    )
+    
+    notes = fields.Text(
+        string='Notas',
+        help="Se copian en cada evento registrado"
+    )
+
+    @api.model
+    def default_get(self, fields_list):
+        """Toma los animales seleccionados en la lista"""
+        res = super().default_get(fields_list)
+        if self.env.context.get('active_model') == 'livestock.animal' and self.env.context.get('active_ids'):
+            res['animal_ids'] = [(6, 0, self.env.context['active_ids'])]
+        return res
+
+    @api.depends('animal_ids')
+    def _compute_animal_count(self):
+        for wizard in self:
+            wizard.animal_count = len(wizard.animal_ids)
+
+    def action_load_lot(self):
+        """Carga los animales activos del lote seleccionado"""
+        self.ensure_one()
+        if not self.lot_id:
+            raise UserError("Debe seleccionar un lote")
+        animals = self.env['livestock.animal'].search([
+            ('current_lot_id', '=', self.lot_id.id),
+            ('status', '=', 'active'),
+        ])
+        self.animal_ids = [(6, 0, animals.ids)]
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'livestock.event.bulk.wizard',
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new'
+        }
+
+    def action_confirm(self):
+        """Registra el evento para todos los animales con una sola creación"""
+        self.ensure_one()
+        if not self.animal_ids:
+            raise UserError("Debe seleccionar al menos un animal")
+        
+        events = self.env['livestock.event'].create([{
+            'event_type': self.event_type,
+            'date': self.date,
+            'animal_id': animal.id,
+            'cause_of_death': self.cause_of_death if self.event_type == 'death' else False,
+            'notes': self.notes,
+        } for animal in self.animal_ids])
+        
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Eventos Registrados',
+            'res_model': 'livestock.event',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', events.ids)],
+        }
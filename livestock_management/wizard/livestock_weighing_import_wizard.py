@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+import base64
+
+
+class LivestockWeighingImportWizard(models.TransientModel):
+    _name = 'livestock.weighing.import.wizard'
+    _description = 'Asistente de Importación de Sesión de Balanza'
+
+    session_file = fields.Binary(
+        string='Archivo de Sesión',
+        required=True,
+        help="Archivo CSV/TSV exportado por la balanza (caravana, peso, fecha)"
+    )
+    
+    session_file_name = fields.Char(
+        string='Nombre del Archivo'
+    )
+    
+    delimiter = fields.Selection([
+        ('auto', 'Detectar automáticamente'),
+        (',', 'Coma (,)'),
+        (';', 'Punto y coma (;)'),
+        ('tab', 'Tabulación'),
+    ], string='Separador', default='auto', required=True)
+    
+    default_date = fields.Date(
+        string='Fecha de la Sesión',
+        default=fields.Date.today,
+        help="Fecha usada para las filas sin marca de tiempo"
+    )
+    
+    weighing_reason = fields.Selection(
+        selection='_get_weighing_reason_selection',
+        string='Motivo del Pesaje',
+        default='routine'
+    )
+    
+    skip_errors = fields.Boolean(
+        string='Omitir Filas con Errores',
+        default=False,
+        help="Importa las filas válidas e informa el resto. "
+             "Si no se marca, la sesión solo se importa si no hay errores."
+    )
+    
+    # Campos de resultado
+    state = fields.Selection([
+        ('init', 'Configuración'),
+        ('done', 'Completado')
+    ], default='init', string='Estado')
+    
+    imported_count = fields.Integer(
+        string='Pesajes Importados',
+        readonly=True
+    )
+    
+    error_message = fields.Text(
+        string='Filas Omitidas',
+        readonly=True
+    )
+    
+    weighing_ids = fields.Many2many(
+        'livestock.weighing',
+        string='Pesajes Creados',
+        readonly=True
+    )
+
+    @api.model
+    def _get_weighing_reason_selection(self):
+        """Reutiliza los motivos de pesaje del modelo de pesajes"""
+        return self.env['livestock.weighing']._fields['weighing_reason'].selection
+
+    def action_import(self):
+        """Importa la sesión de balanza"""
+        self.ensure_one()
+        if not self.session_file:
+            raise UserError("Debe seleccionar un archivo de sesión")
+        
+        delimiter = {'auto': None, 'tab': '\t'}.get(self.delimiter, self.delimiter)
+        weighings, errors = self.env['livestock.weighing'].import_scale_session(
+            base64.b64decode(self.session_file),
+            default_date=self.default_date,
+            weighing_reason=self.weighing_reason,
+            delimiter=delimiter,
+            skip_errors=self.skip_errors,
+        )
+        
+        self.write({
+            'state': 'done',
+            'imported_count': len(weighings),
+            'error_message': self.env['livestock.weighing']._format_import_errors(errors) if errors else False,
+            'weighing_ids': [(6, 0, weighings.ids)],
+        })
+        
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'livestock.weighing.import.wizard',
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new'
+        }
+
+    def action_view_weighings(self):
+        """Muestra los pesajes importados"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Pesajes Importados',
+            'res_model': 'livestock.weighing',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', self.weighing_ids.ids)],
+        }
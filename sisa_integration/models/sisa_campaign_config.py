@@ -6,6 +6,7 @@ from odoo.exceptions import ValidationError
 
 class SisaCampaignConfig(models.Model):
     _name = 'sisa.campaign.config'
+    _inherit = ['farm.selection.label.mixin']
     _description = 'Configuración de Campañas SISA'
     _order = 'campaign_type, sequence'
 
@@ -112,7 +113,7 @@ class SisaCampaignConfig(models.Model):
                     ('id', '!=', record.id)
                 ])
                 if existing:
-                    campaign_name = dict(record._fields['campaign_type'].selection)[record.campaign_type]
+                    campaign_name = record._get_selection_label('campaign_type')
                     raise ValidationError(
                         f"Ya existe una configuración activa para {campaign_name} "
                         f"en la compañía {record.company_id.name}"
@@ -121,8 +122,9 @@ class SisaCampaignConfig(models.Model):
     def name_get(self):
         """Custom name_get"""
         result = []
+        campaign_names = self._get_selection_labels('campaign_type')
         for record in self:
-            campaign_name = dict(record._fields['campaign_type'].selection)[record.campaign_type]
+            campaign_name = campaign_names[record.campaign_type]
             name = f"{campaign_name} - {record.name}"
             result.append((record.id, name))
         return result
@@ -11,7 +11,7 @@ _logger = logging.getLogger(__name__)
 class SisaDeclaration(models.Model):
     _name = 'sisa.declaration'
     _description = 'Declaración SISA'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'farm.selection.label.mixin']
     _order = 'year desc, declaration_type'
     _rec_name = 'display_name'
 
@@ -127,9 +127,10 @@ class SisaDeclaration(models.Model):
     @api.depends('declaration_type', 'year')
     def _compute_display_name(self):
         """Compute display name for the declaration"""
+        type_names = self._get_selection_labels('declaration_type')
         for record in self:
             if record.declaration_type and record.year:
-                type_name = dict(record._fields['declaration_type'].selection)[record.declaration_type]
+                type_name = type_names[record.declaration_type]
                 if record.declaration_type == 'ip2':
                     # IP2 abarca dos años (ej: 2025/2026)
                     record.display_name = f"{type_name} - {record.year}/{record.year + 1}"
@@ -179,7 +180,7 @@ class SisaDeclaration(models.Model):
                 ('id', '!=', record.id)
             ])
             if existing:
-                type_name = dict(record._fields['declaration_type'].selection)[record.declaration_type]
+                type_name = record._get_selection_label('declaration_type')
                 raise ValidationError(
                     f"Ya existe una declaración {type_name} para el año {record.year} "
                     f"en la compañía {record.company_id.name}"
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from odoo.tests import tagged
+
+from odoo.addons.farm_management_v18.tests.common import ComputeQueryCountCase
+
+# Una declaración por tipo, año y compañía: combinaciones disponibles por compañía
+DECLARATION_TYPES = ('ip1', 'ip2')
+DECLARATION_YEARS = tuple(range(2020, datetime.now().year + 3))
+
+
+@tagged('post_install', '-at_install')
+class TestSisaComputeQueryCounts(ComputeQueryCountCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.farm_field = cls._create_farm_field()
+        cls.lot = cls.env['farm.lot'].create({
+            'name': 'Lote de Prueba', 'field_id': cls.farm_field.id, 'area': 500.0,
+        })
+        cls.grain = cls.env['product.product'].create({'name': 'Grano de Prueba', 'type': 'consu'})
+        cls.location = cls.env['stock.location'].create({'name': 'Silo de Prueba', 'usage': 'internal'})
+
+    def _create_declarations(self, size):
+        """Crea declaraciones con una línea de stock y una de superficie cada una"""
+        combinations = [(declaration_type, year) for declaration_type in DECLARATION_TYPES for year in DECLARATION_YEARS]
+        companies = self.env['res.company'].create([
+            {'name': f'Compañía SISA {index}'} for index in range(-(-size // len(combinations)))
+        ])
+        declarations = self.env['sisa.declaration']
+        for index in range(size):
+            declaration_type, year = combinations[index % len(combinations)]
+            declarations |= declarations.create({
+                'declaration_type': declaration_type,
+                'year': year,
+                'company_id': companies[index // len(combinations)].id,
+                'stock_line_ids': [(0, 0, {
+                    'product_id': self.grain.id,
+                    'location_id': self.location.id,
+                    'quantity_kg': 1000.0 + index,
+                })],
+                'surface_line_ids': [(0, 0, {
+                    'crop_id': self.grain.id,
+                    'field_id': self.farm_field.id,
+                    'lot_id': self.lot.id,
+                    'area': 100.0,
+                })],
+            })
+        return declarations
+
+    def test_declaration_totals(self):
+        self.assertComputeQueries(
+            self._create_declarations,
+            ['total_stock_kg', 'total_surface_ha', 'display_name'],
+            max_queries=8,
+        )
@@ -90,12 +90,12 @@ class SisaExportWizard(models.TransientModel):
         for wizard in self:
             if wizard.declaration_id:
                 decl = wizard.declaration_id
-                type_name = dict(decl._fields['declaration_type'].selection)[decl.declaration_type]
+                type_name = decl._get_selection_label('declaration_type')
                 
                 info = f"""
                 <div class="alert alert-info">
                     <strong>{type_name} - {decl.year}</strong><br/>
-                    Estado: <span class="badge badge-{decl.state}">{dict(decl._fields['state'].selection)[decl.state]}</span><br/>
+                    Estado: <span class="badge badge-{decl.state}">{decl._get_selection_label('state')}</span><br/>
                     Fecha de Generación: {decl.generation_date.strftime('%d/%m/%Y %H:%M')}<br/>
                 """
                 